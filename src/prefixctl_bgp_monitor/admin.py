@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from prefixctl_bgp_monitor.models import BGPMonitor
+from prefixctl_bgp_monitor.models import (
+    BGPMonitor,
+    BGPMonitorAlertState,
+    BGPMonitorShardNode,
+    BGPMonitorSummary,
+    BGPMonitorSuppression,
+)
 
 # Register your models here.
 
@@ -23,3 +29,46 @@ class BGPMonitorAdmin(admin.ModelAdmin):
         "prefix_set__prefix_set__prefix",
     )
     autocomplete_fields = ("prefix_set", "asn_set_origin")
+
+
+@admin.register(BGPMonitorShardNode)
+class BGPMonitorShardNodeAdmin(admin.ModelAdmin):
+    list_display = ("node", "heavy", "heartbeat")
+    search_fields = ("node",)
+
+
+@admin.register(BGPMonitorSummary)
+class BGPMonitorSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "instance",
+        "announcements",
+        "hijacks",
+        "more_specifics",
+        "updated",
+    )
+    search_fields = ("instance__org__name", "instance__org__slug")
+    readonly_fields = ("asns", "top_asns", "events")
+
+
+@admin.register(BGPMonitorAlertState)
+class BGPMonitorAlertStateAdmin(admin.ModelAdmin):
+    list_display = (
+        "monitor",
+        "prefix",
+        "asn",
+        "type",
+        "state",
+        "flaps",
+        "changed",
+    )
+    list_filter = ("state", "type")
+    search_fields = ("prefix", "asn", "monitor__prefix_set__name")
+    autocomplete_fields = ("monitor",)
+
+
+@admin.register(BGPMonitorSuppression)
+class BGPMonitorSuppressionAdmin(admin.ModelAdmin):
+    list_display = ("monitor", "prefix", "asn", "start", "end", "reason")
+    search_fields = ("prefix", "asn", "reason", "monitor__prefix_set__name")
+    autocomplete_fields = ("monitor",)
+    readonly_fields = ("instance",)
@@ -0,0 +1,314 @@
+"""
+Alert state machine for BGP monitor notifications
+
+Every (prefix, asn, type) seen by a monitor has a persisted BGPMonitorAlertState
+tracking whether it is currently observed and whether the user was last
+notified about it being present or gone. A notification is only sent once an
+observation has been stable for the hold-down time and the alert is neither
+damped nor inside a suppression window:
+
+    cleared -> pending -> active -> clearing -> cleared
+
+Flap damping works like BGP route flap damping: every flip of the observed
+state adds `BGP_MONITOR_ALERT_FLAP_PENALTY`, the penalty decays with a half-life
+of `BGP_MONITOR_ALERT_HALF_LIFE` seconds. Alerts are damped while the penalty
+is above `BGP_MONITOR_ALERT_SUPPRESS_THRESHOLD` and until it has decayed below
+`BGP_MONITOR_ALERT_REUSE_THRESHOLD`.
+
+Transitions during a user defined suppression window (BGPMonitorSuppression)
+are adopted silently, so planned moves don't alert when the window ends.
+
+Monitors only run once per `BGP_MONITOR_SCHEDULE_INTERVAL`, so while alerts are
+in hold-down the monitor's task schedule is moved up to when the earliest one
+expires (see `next_check`).
+"""
+import datetime
+import ipaddress
+from typing import TYPE_CHECKING, Union
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from prefixctl_bgp_monitor.models import (
+        BGPMonitor,
+        BGPMonitorAlertState,
+        BGPMonitorSuppression,
+    )
+    from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
+__all__ = [
+    "observed_alerts",
+    "decayed_penalty",
+    "is_suppressed",
+    "is_expired",
+    "advance",
+    "hold_down_expires",
+    "next_check",
+    "process_alerts",
+]
+
+# states waiting for the hold-down to pass before being notified
+HOLD_DOWN_STATES = ("pending", "clearing")
+
+ALERT_TYPES = {"hijack": "hijacks", "more_specific": "more_specifics"}
+
+
+def observed_alerts(results: "BGPMonitorResults") -> set[tuple[str, int, str]]:
+    """
+    Returns the (prefix, asn, type) keys of all alertable lines in the results
+    """
+    return {
+        (prefix, asn, alert_type)
+        for alert_type, field in ALERT_TYPES.items()
+        for prefix, asns in getattr(results, field).items()
+        for asn in asns
+    }
+
+
+def decayed_penalty(state: "BGPMonitorAlertState", now: datetime.datetime) -> float:
+    """
+    Returns the flap penalty of the alert state decayed to `now`
+    """
+    if not state.penalty or not state.penalty_updated:
+        return 0.0
+    elapsed = max((now - state.penalty_updated).total_seconds(), 0)
+    return state.penalty * 0.5 ** (elapsed / settings.BGP_MONITOR_ALERT_HALF_LIFE)
+
+
+def is_suppressed(
+    suppressions: list["BGPMonitorSuppression"], prefix: str, asn: int
+) -> bool:
+    """
+    Returns whether any of the active suppression windows covers the alert
+    """
+    network = None
+    for suppression in suppressions:
+        if suppression.asn is not None and suppression.asn != asn:
+            continue
+        if suppression.prefix:
+            network = network or ipaddress.ip_network(prefix)
+            covering = ipaddress.ip_network(suppression.prefix)
+            if network.version != covering.version or not network.subnet_of(covering):
+                continue
+        return True
+    return False
+
+
+def is_expired(state: "BGPMonitorAlertState", now: datetime.datetime) -> bool:
+    """
+    Returns whether the alert state is settled as cleared with no flap
+    history left worth remembering, so it can be deleted
+    """
+    return state.state == "cleared" and decayed_penalty(state, now) < 1
+
+
+def _label(state: "BGPMonitorAlertState", suppressed: bool) -> str:
+    if suppressed:
+        return "suppressed"
+    if state.damped:
+        return "damped"
+    if state.observed:
+        return "active" if state.notified else "pending"
+    return "clearing" if state.notified else "cleared"
+
+
+def advance(
+    state: "BGPMonitorAlertState",
+    observed: bool,
+    suppressed: bool,
+    now: datetime.datetime,
+) -> tuple[bool, Union[bool, None]]:
+    """
+    Advance a single alert state with whether the alert was observed by
+    the current run and whether a suppression window covers it
+
+    Returns a tuple of (dirty, notify) where `dirty` is True if the state
+    was modified and `notify` is True / False if the alert should be notified
+    as added / removed, None if nothing should be notified
+    """
+
+    dirty = False
+    notify = None
+
+    if state.observed != observed:
+        # flap, apply penalty
+        penalty = decayed_penalty(state, now)
+        state.penalty = penalty + settings.BGP_MONITOR_ALERT_FLAP_PENALTY
+        state.penalty_updated = now
+        state.flaps += 1
+        state.observed = observed
+        state.changed = now
+        dirty = True
+
+    penalty = decayed_penalty(state, now)
+
+    if not state.damped and penalty >= settings.BGP_MONITOR_ALERT_SUPPRESS_THRESHOLD:
+        state.damped = True
+        dirty = True
+    elif state.damped and penalty < settings.BGP_MONITOR_ALERT_REUSE_THRESHOLD:
+        state.damped = False
+        dirty = True
+
+    hold_down = datetime.timedelta(seconds=settings.BGP_MONITOR_ALERT_HOLD_DOWN)
+
+    if state.observed != state.notified:
+        if suppressed:
+            # planned change, adopt silently
+            state.notified = state.observed
+            dirty = True
+        elif not state.damped and now - state.changed >= hold_down:
+            notify = state.observed
+            state.notified = state.observed
+            dirty = True
+
+    label = _label(state, suppressed)
+    if label != state.state:
+        state.state = label
+        dirty = True
+
+    return dirty, notify
+
+
+def hold_down_expires(
+    state: "BGPMonitorAlertState",
+) -> Union[datetime.datetime, None]:
+    """
+    Returns when the alert state leaves hold-down, None if it is not
+    waiting for it
+    """
+    if state.state not in HOLD_DOWN_STATES:
+        return None
+    return state.changed + datetime.timedelta(
+        seconds=settings.BGP_MONITOR_ALERT_HOLD_DOWN
+    )
+
+
+def next_check(monitor: "BGPMonitor") -> Union[datetime.datetime, None]:
+    """
+    Returns when the earliest alert of the monitor that is in hold-down
+    can be confirmed, None if no alert is waiting for it
+    """
+    if not settings.BGP_MONITOR_ALERT_HOLD_DOWN:
+        return None
+
+    changed = monitor.alert_states.filter(state__in=HOLD_DOWN_STATES).aggregate(
+        changed=Min("changed")
+    )["changed"]
+
+    if changed is None:
+        return None
+
+    return changed + datetime.timedelta(seconds=settings.BGP_MONITOR_ALERT_HOLD_DOWN)
+
+
+def process_alerts(
+    monitor: "BGPMonitor",
+    results: "BGPMonitorResults",
+    changed: bool = True,
+    now: datetime.datetime = None,
+) -> tuple["BGPMonitorResults", "BGPMonitorResults"]:
+    """
+    Advance the alert state machine of a monitor with the results of a run
+
+    If `changed` is False the results are the same as in the previous run and
+    only alerts that have not settled yet (pending, clearing, damped, suppressed)
+    are evaluated.
+
+    Returns a tuple of two BGPMonitorResults objects containing the confirmed
+    added and removed alerts that should be notified
+    """
+
+    from prefixctl_bgp_monitor.models import BGPMonitorAlertState
+    from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
+    now = now or timezone.now()
+
+    observed = observed_alerts(results)
+
+    qset = monitor.alert_states.all()
+    if not changed:
+        qset = qset.exclude(state__in=["active", "cleared"])
+
+    states = {(state.prefix, state.asn, state.type): state for state in qset}
+
+    if changed:
+        keys = observed | states.keys()
+    else:
+        keys = states.keys()
+
+    if not keys:
+        return BGPMonitorResults(), BGPMonitorResults()
+
+    suppressions = list(monitor.suppressions.filter(start__lte=now, end__gt=now))
+
+    added = BGPMonitorResults()
+    removed = BGPMonitorResults()
+
+    create = []
+    update = []
+    delete = []
+
+    for key in keys:
+        prefix, asn, alert_type = key
+        is_observed = key in observed
+        state = states.get(key)
+        created = state is None
+
+        if created:
+            state = BGPMonitorAlertState(
+                monitor=monitor,
+                prefix=prefix,
+                asn=asn,
+                type=alert_type,
+                observed=is_observed,
+                notified=False,
+                changed=now,
+            )
+
+        dirty, notify = advance(
+            state, is_observed, is_suppressed(suppressions, prefix, asn), now
+        )
+        dirty = dirty or created
+
+        if notify is not None:
+            target = added if notify else removed
+            target = getattr(target, ALERT_TYPES[alert_type])
+            target.setdefault(prefix, []).append(asn)
+
+        if is_expired(state, now):
+            if state.pk:
+                delete.append(state.pk)
+            continue
+
+        if not dirty:
+            continue
+
+        if state.pk:
+            update.append(state)
+        else:
+            create.append(state)
+
+    with transaction.atomic():
+        if delete:
+            BGPMonitorAlertState.objects.filter(pk__in=delete).delete()
+        if update:
+            BGPMonitorAlertState.objects.bulk_update(
+                update,
+                [
+                    "state",
+                    "observed",
+                    "notified",
+                    "damped",
+                    "changed",
+                    "penalty",
+                    "penalty_updated",
+                    "flaps",
+                ],
+            )
+        if create:
+            BGPMonitorAlertState.objects.bulk_create(create)
+
+    return added, removed
@@ -6,6 +6,9 @@ class PrefixCtlBGPMonitorConfig(AppConfig):
     name = "prefixctl_bgp_monitor"
 
     def ready(self):
+        # these only register settings, routes and signal receivers, the
+        # monitor engine is loaded lazily when a task runs or a report is requested
+        # (see `bgp_monitor_startup_bench` to measure start-up cost)
         import prefixctl_bgp_monitor.settings  # noqa
         import prefixctl_bgp_monitor.serializers  # noqa
         import prefixctl_bgp_monitor.views  # noqa
@@ -0,0 +1,32 @@
+import asyncio
+
+import structlog
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from fullctl.django.management.commands.fullctl_poll_tasks import (
+    Command as PollTasksCommand,
+)
+
+from prefixctl_bgp_monitor.sharding import heartbeat
+
+log = structlog.get_logger("django")
+
+
+class Command(PollTasksCommand):
+    help = "Process task queue, announcing this worker as a BGP monitor shard node"
+
+    async def _poll_tasks(self):
+        await asyncio.gather(super()._poll_tasks(), self._heartbeat())
+
+    async def _heartbeat(self):
+        """
+        Heartbeat independently of pending tasks so the node stays on the
+        hash ring between monitor runs
+        """
+        while True:
+            try:
+                if settings.BGP_MONITOR_SHARDING:
+                    await sync_to_async(heartbeat)(force=True)
+            except Exception as exc:
+                log.exception("Error sending shard heartbeat", exc=exc)
+            await asyncio.sleep(settings.BGP_MONITOR_SHARD_NODE_TTL / 3)
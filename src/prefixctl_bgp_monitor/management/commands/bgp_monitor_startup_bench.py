@@ -0,0 +1,112 @@
+"""
+Measure django start-up time and baseline RSS of a worker process
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# modules that should only be loaded when a monitor runs or a report is requested
+LAZY_MODULES = [
+    "prefixctl_bgp_monitor.monitor",
+    "prefixctl_bgp_monitor.alerts",
+    "prefix_meta.sources.irr_explorer",
+    "pydantic",
+    "fullctl.django.mail",
+]
+
+# executed in a fresh interpreter for every run, DJANGO_SETTINGS_MODULE
+# is inherited from the environment of this command
+BENCH_SCRIPT = """
+import json, resource, sys, time
+
+def rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macos and kilobytes elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+start = time.perf_counter()
+
+import django
+django.setup()
+
+startup = time.perf_counter() - start
+startup_rss = rss()
+loaded = [name for name in {lazy_modules!r} if name in sys.modules]
+
+start = time.perf_counter()
+import prefixctl_bgp_monitor.monitor
+engine = time.perf_counter() - start
+
+print(json.dumps({{
+    "startup": startup,
+    "startup_rss": startup_rss,
+    "engine": engine,
+    "engine_rss": rss(),
+    "loaded": loaded,
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure django start-up time and baseline RSS of a worker process"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Number of processes to sample"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Output results as json"
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Fail if the monitor engine is loaded during start-up",
+        )
+
+    def sample(self):
+        script = BENCH_SCRIPT.format(lazy_modules=LAZY_MODULES)
+        proc = subprocess.run(  # nosec
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+        if proc.returncode:
+            raise CommandError(proc.stderr)
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        samples = [self.sample() for _ in range(max(options["runs"], 1))]
+
+        result = {
+            "runs": len(samples),
+            "startup_seconds": statistics.median(s["startup"] for s in samples),
+            "startup_rss_kb": max(s["startup_rss"] for s in samples),
+            "engine_seconds": statistics.median(s["engine"] for s in samples),
+            "engine_rss_kb": max(s["engine_rss"] for s in samples),
+            "loaded_at_startup": samples[0]["loaded"],
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self.stdout.write(f"runs: {result['runs']}")
+            self.stdout.write(
+                f"startup: {result['startup_seconds']:.3f}s, "
+                f"rss {result['startup_rss_kb']} KB"
+            )
+            self.stdout.write(
+                f"monitor engine: +{result['engine_seconds']:.3f}s, "
+                f"rss {result['engine_rss_kb']} KB"
+            )
+            self.stdout.write(
+                "loaded at startup: "
+                + (", ".join(result["loaded_at_startup"]) or "none")
+            )
+
+        if (
+            options["strict"]
+            and "prefixctl_bgp_monitor.monitor" in result["loaded_at_startup"]
+        ):
+            raise CommandError("monitor engine was loaded during start-up")
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.10 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("prefixctl_bgp_monitor", "0002_bgpmonitor_result"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BGPMonitorShardNode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("node", models.CharField(max_length=255, unique=True)),
+                (
+                    "heavy",
+                    models.BooleanField(
+                        default=False, help_text="Node only processes heavy monitors"
+                    ),
+                ),
+                ("heartbeat", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "BGP Monitor Shard Node",
+                "verbose_name_plural": "BGP Monitor Shard Nodes",
+                "db_table": "prefixctl_bgp_monitor_shard_node",
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.10 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+from prefixctl_bgp_monitor.migrations._snapshot_v1 import decode, encode
+
+
+def forwards(apps, schema_editor):
+    BGPMonitor = apps.get_model("prefixctl_bgp_monitor", "BGPMonitor")
+    for monitor in BGPMonitor.objects.exclude(result__isnull=True).iterator():
+        monitor.snapshot = encode(monitor.result)
+        monitor.save(update_fields=["snapshot"])
+
+
+def backwards(apps, schema_editor):
+    BGPMonitor = apps.get_model("prefixctl_bgp_monitor", "BGPMonitor")
+    for monitor in BGPMonitor.objects.exclude(snapshot__isnull=True).iterator():
+        monitor.result = decode(monitor.snapshot)
+        monitor.save(update_fields=["result"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("prefixctl_bgp_monitor", "0003_bgpmonitorshardnode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bgpmonitor",
+            name="snapshot",
+            field=models.BinaryField(
+                blank=True,
+                help_text="The last result of the monitor as a binary snapshot",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name="bgpmonitor",
+            name="result",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-19 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("prefixctl_bgp_monitor", "0004_bgpmonitor_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bgpmonitor",
+            name="fingerprints",
+            field=models.JSONField(
+                blank=True,
+                help_text="Per prefix content fingerprints of the last result",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 4.2.10 on 2026-10-19 13:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from prefixctl_bgp_monitor.migrations._snapshot_v1 import decode
+
+
+def forwards(apps, schema_editor):
+    """
+    Build the initial summaries from the stored monitor snapshots
+    """
+    BGPMonitor = apps.get_model("prefixctl_bgp_monitor", "BGPMonitor")
+    BGPMonitorSummary = apps.get_model("prefixctl_bgp_monitor", "BGPMonitorSummary")
+
+    top_asns = getattr(settings, "BGP_MONITOR_SUMMARY_TOP_ASNS", 10)
+    summaries = {}
+
+    for monitor in BGPMonitor.objects.exclude(snapshot__isnull=True).iterator():
+        summary = summaries.get(monitor.instance_id)
+        if summary is None:
+            summary = summaries[monitor.instance_id] = BGPMonitorSummary(
+                instance_id=monitor.instance_id, asns={}
+            )
+
+        snapshot = decode(monitor.snapshot)
+
+        for field in ["announcements", "hijacks", "more_specifics"]:
+            section = snapshot[field]
+            setattr(
+                summary,
+                field,
+                getattr(summary, field) + sum(len(asns) for asns in section.values()),
+            )
+
+        for hijackers in snapshot["hijacks"].values():
+            for asn in hijackers:
+                summary.asns[str(asn)] = summary.asns.get(str(asn), 0) + 1
+
+    for summary in summaries.values():
+        ranked = sorted(summary.asns.items(), key=lambda item: (-item[1], int(item[0])))
+        summary.top_asns = [
+            {"asn": int(asn), "count": count} for asn, count in ranked[:top_asns]
+        ]
+        summary.save()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_fullctl", "0033_task_fullctl_tas_status_d88ee1_idx_and_more"),
+        ("prefixctl_bgp_monitor", "0005_bgpmonitor_fingerprints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BGPMonitorSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "announcements",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of announcement (prefix, asn) pairs",
+                    ),
+                ),
+                (
+                    "hijacks",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of hijack (prefix, asn) pairs"
+                    ),
+                ),
+                (
+                    "more_specifics",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of more specific (prefix, asn) pairs",
+                    ),
+                ),
+                (
+                    "asns",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Number of hijacked prefixes per offending ASN",
+                    ),
+                ),
+                (
+                    "top_asns",
+                    models.JSONField(
+                        default=list,
+                        help_text="Offending ASNs with the most hijacked prefixes",
+                    ),
+                ),
+                (
+                    "events",
+                    models.JSONField(
+                        default=list, help_text="Newest events, newest first"
+                    ),
+                ),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "instance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bgp_monitor_summary",
+                        to="django_fullctl.instance",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "BGP Monitor Summary",
+                "verbose_name_plural": "BGP Monitor Summaries",
+                "db_table": "prefixctl_bgp_monitor_summary",
+            },
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
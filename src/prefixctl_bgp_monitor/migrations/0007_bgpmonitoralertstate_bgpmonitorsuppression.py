@@ -0,0 +1,214 @@
+# Generated by Django 4.2.10 on 2026-10-19 15:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from prefixctl_bgp_monitor.migrations._snapshot_v1 import decode
+
+
+def forwards(apps, schema_editor):
+    """
+    Seed active alert states from the stored monitor snapshots so existing
+    hijacks and more specifics are not notified again
+    """
+    BGPMonitor = apps.get_model("prefixctl_bgp_monitor", "BGPMonitor")
+    BGPMonitorAlertState = apps.get_model(
+        "prefixctl_bgp_monitor", "BGPMonitorAlertState"
+    )
+
+    now = timezone.now()
+
+    for monitor in BGPMonitor.objects.exclude(snapshot__isnull=True).iterator():
+        snapshot = decode(monitor.snapshot)
+        states = []
+        for alert_type, field in [
+            ("hijack", "hijacks"),
+            ("more_specific", "more_specifics"),
+        ]:
+            for prefix, asns in snapshot[field].items():
+                for asn in asns:
+                    states.append(
+                        BGPMonitorAlertState(
+                            monitor_id=monitor.id,
+                            prefix=prefix,
+                            asn=asn,
+                            type=alert_type,
+                            state="active",
+                            observed=True,
+                            notified=True,
+                            changed=now,
+                        )
+                    )
+        BGPMonitorAlertState.objects.bulk_create(states)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_fullctl", "0033_task_fullctl_tas_status_d88ee1_idx_and_more"),
+        ("prefixctl_bgp_monitor", "0006_bgpmonitorsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BGPMonitorSuppression",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "prefix",
+                    models.CharField(
+                        blank=True,
+                        help_text="Only suppress alerts for this prefix and its more specifics",
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "asn",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Only suppress alerts for this ASN",
+                        null=True,
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                ("reason", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bgp_monitor_suppressions",
+                        to="django_fullctl.instance",
+                    ),
+                ),
+                (
+                    "monitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suppressions",
+                        to="prefixctl_bgp_monitor.bgpmonitor",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "BGP Monitor Suppression",
+                "verbose_name_plural": "BGP Monitor Suppressions",
+                "db_table": "prefixctl_bgp_monitor_suppression",
+                "indexes": [
+                    models.Index(
+                        fields=["monitor", "end"],
+                        name="prefixctl_b_monitor_324690_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="BGPMonitorAlertState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("prefix", models.CharField(max_length=64)),
+                ("asn", models.BigIntegerField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("hijack", "Hijack"),
+                            ("more_specific", "More specific"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("active", "Active"),
+                            ("clearing", "Clearing"),
+                            ("cleared", "Cleared"),
+                            ("damped", "Damped"),
+                            ("suppressed", "Suppressed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "observed",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Alert was present in the last monitor run",
+                    ),
+                ),
+                (
+                    "notified",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Last notification reported the alert as present",
+                    ),
+                ),
+                (
+                    "damped",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Notifications are held back due to flapping",
+                    ),
+                ),
+                (
+                    "changed",
+                    models.DateTimeField(help_text="When `observed` last changed"),
+                ),
+                (
+                    "penalty",
+                    models.FloatField(default=0, help_text="Flap damping penalty"),
+                ),
+                (
+                    "penalty_updated",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the penalty was last increased",
+                        null=True,
+                    ),
+                ),
+                ("flaps", models.PositiveIntegerField(default=0)),
+                (
+                    "monitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alert_states",
+                        to="prefixctl_bgp_monitor.bgpmonitor",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "BGP Monitor Alert State",
+                "verbose_name_plural": "BGP Monitor Alert States",
+                "db_table": "prefixctl_bgp_monitor_alert_state",
+                "indexes": [
+                    models.Index(
+                        fields=["monitor", "state"],
+                        name="prefixctl_b_monitor_3c3cb0_idx",
+                    )
+                ],
+                "unique_together": {("monitor", "prefix", "asn", "type")},
+            },
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+"""
+Frozen copy of the version 1 snapshot codec for use in migrations
+
+Historical migrations must keep working when prefixctl_bgp_monitor.snapshot
+moves to a new format version, do not change this module.
+
+Django's migration loader skips modules starting with an underscore.
+"""
+import ipaddress
+import struct
+
+SECTIONS = ("announcements", "hijacks", "more_specifics")
+
+_HEADER = struct.Struct("<4sB")
+_COUNT = struct.Struct("<I")
+_PREFIX = struct.Struct("<BB")
+
+
+def encode(results: dict) -> bytes:
+    parts = [_HEADER.pack(b"BGPS", 1)]
+
+    for section in SECTIONS:
+        packed = []
+        for prefix, asns in (results.get(section) or {}).items():
+            network = ipaddress.ip_network(prefix)
+            key = (
+                _PREFIX.pack(network.version, network.prefixlen)
+                + network.network_address.packed
+            )
+            packed.append((key, asns))
+        packed.sort()
+
+        parts.append(_COUNT.pack(len(packed)))
+
+        for key, asns in packed:
+            deltas = []
+            last = 0
+            for asn in sorted(set(asns)):
+                deltas.append(asn - last)
+                last = asn
+            parts.append(key)
+            parts.append(struct.pack(f"<I{len(deltas)}I", len(deltas), *deltas))
+
+    return b"".join(parts)
+
+
+def decode(data) -> dict[str, dict[str, list[int]]]:
+    data = bytes(data)
+
+    magic, version = _HEADER.unpack_from(data)
+    if magic != b"BGPS" or version != 1:
+        raise ValueError("Not a version 1 BGP monitor snapshot")
+
+    offset = _HEADER.size
+    results = {}
+
+    for section in SECTIONS:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+
+        entries = results[section] = {}
+
+        for _ in range(count):
+            family, prefixlen = _PREFIX.unpack_from(data, offset)
+            offset += _PREFIX.size
+
+            size = 4 if family == 4 else 16
+            address = ipaddress.ip_address(data[offset : offset + size])
+            offset += size
+
+            (n,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+
+            asns = []
+            last = 0
+            for (delta,) in struct.iter_unpack("<I", data[offset : offset + n * 4]):
+                last += delta
+                asns.append(last)
+            offset += n * 4
+
+            entries[f"{address}/{prefixlen}"] = asns
+
+    return results
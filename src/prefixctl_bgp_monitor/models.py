@@ -1,16 +1,24 @@
-from typing import Union
+import datetime
+import json
+from typing import TYPE_CHECKING, Union
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_grainy.decorators import grainy_model
 from django_prefixctl.models import ASNSet, Monitor, PrefixSet, register_prefix_monitor
-from fullctl.django.mail import send_plain
 from fullctl.django.models import Instance, Task, TaskSchedule
 from fullctl.django.tasks import register as register_task
 
-from prefixctl_bgp_monitor.monitor import BGPMonitorResults, bgp_monitor
+from prefixctl_bgp_monitor.sharding import ShardQualifier
+from prefixctl_bgp_monitor.summary import apply_diff, is_empty
+
+# the monitor engine (pydantic, IRR Explorer sources) and mail helpers are
+# imported where they are used so that processes that never run a monitor
+# or load a report don't pay for them at startup
+if TYPE_CHECKING:
+    from prefixctl_bgp_monitor.monitor import BGPMonitorResults
 
 PERMISSION_NAMESPACE = "prefix_monitor"
 PERMISSION_NAMESPACE_INSTANCE = "prefix_monitor.{instance.instance.org.permission_id}"
@@ -62,10 +70,16 @@ class BGPMonitor(Monitor):
         help_text="The last time the monitor was checked",
     )
 
-    result = models.JSONField(
+    snapshot = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="The last result of the monitor as a binary snapshot",
+    )
+
+    fingerprints = models.JSONField(
         null=True,
         blank=True,
-        help_text="The last result of the monitor",
+        help_text="Per prefix content fingerprints of the last result",
     )
 
     class Meta:
@@ -76,6 +90,32 @@ class BGPMonitor(Monitor):
     class HandleRef:
         tag = "bgp_monitor"
 
+    @property
+    def results(self) -> Union["BGPMonitorResults", None]:
+        """
+        The last result of the monitor decoded from its snapshot
+        """
+        if not self.snapshot:
+            return None
+
+        from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
+        return BGPMonitorResults.from_snapshot(self.snapshot)
+
+    def schedule_check(self, when: datetime.datetime):
+        """
+        Move the next scheduled run of the monitor up to `when`
+
+        Does nothing if the monitor is not scheduled or already scheduled
+        to run earlier. The regular interval resumes after that run.
+        """
+        if not self.task_schedule_id:
+            return
+
+        TaskSchedule.objects.filter(
+            id=self.task_schedule_id, schedule__gt=when
+        ).update(schedule=when)
+
     @property
     def schedule_interval(self):
         """
@@ -104,6 +144,238 @@ class BGPMonitor(Monitor):
         }
 
 
+class BGPMonitorShardNode(models.Model):
+
+    """
+    Task worker node participating in sharded monitor execution.
+
+    Nodes heartbeat while polling for tasks, nodes without a recent
+    heartbeat are dropped from the hash ring.
+    """
+
+    node = models.CharField(max_length=255, unique=True)
+
+    heavy = models.BooleanField(
+        default=False, help_text="Node only processes heavy monitors"
+    )
+
+    heartbeat = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "prefixctl_bgp_monitor_shard_node"
+        verbose_name = "BGP Monitor Shard Node"
+        verbose_name_plural = "BGP Monitor Shard Nodes"
+
+    def __str__(self):
+        return self.node
+
+
+class BGPMonitorSummary(models.Model):
+
+    """
+    Organization wide aggregate of all BGP monitors in an instance.
+
+    Maintained incrementally from the diff of each monitor run so it can be
+    read without touching the monitor results.
+    """
+
+    instance = models.OneToOneField(
+        Instance, related_name="bgp_monitor_summary", on_delete=models.CASCADE
+    )
+
+    announcements = models.PositiveIntegerField(
+        default=0, help_text="Number of announcement (prefix, asn) pairs"
+    )
+    hijacks = models.PositiveIntegerField(
+        default=0, help_text="Number of hijack (prefix, asn) pairs"
+    )
+    more_specifics = models.PositiveIntegerField(
+        default=0, help_text="Number of more specific (prefix, asn) pairs"
+    )
+
+    asns = models.JSONField(
+        default=dict, help_text="Number of hijacked prefixes per offending ASN"
+    )
+    top_asns = models.JSONField(
+        default=list, help_text="Offending ASNs with the most hijacked prefixes"
+    )
+    events = models.JSONField(default=list, help_text="Newest events, newest first")
+
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "prefixctl_bgp_monitor_summary"
+        verbose_name = "BGP Monitor Summary"
+        verbose_name_plural = "BGP Monitor Summaries"
+
+    def __str__(self):
+        return f"{self.instance}"
+
+    @classmethod
+    def update(
+        cls,
+        instance_id: int,
+        added: "BGPMonitorResults",
+        removed: "BGPMonitorResults",
+        monitor: BGPMonitor = None,
+        create: bool = True,
+    ):
+        """
+        Apply a monitor result diff to the instance summary
+
+        Arguments:
+
+        - instance_id: the id of the instance the monitor belongs to
+        - added: results added since the previous run
+        - removed: results removed since the previous run
+        - monitor: the monitor the diff belongs to, used to label events
+        - create: create the summary if it does not exist yet
+        """
+
+        # changed fingerprints often produce the same results, don't lock
+        # the organization wide row for nothing
+        if is_empty(added, removed):
+            return
+
+        with transaction.atomic():
+            if create:
+                cls.objects.get_or_create(instance_id=instance_id)
+
+            summary = (
+                cls.objects.select_for_update().filter(instance_id=instance_id).first()
+            )
+
+            if not summary:
+                return
+
+            summary.apply(added, removed, monitor)
+            summary.save()
+
+    def apply(
+        self,
+        added: "BGPMonitorResults",
+        removed: "BGPMonitorResults",
+        monitor: BGPMonitor = None,
+    ):
+        """
+        Apply a monitor result diff to the summary counters
+
+        See prefixctl_bgp_monitor.summary
+        """
+        apply_diff(self, added, removed, monitor)
+
+
+class BGPMonitorAlertState(models.Model):
+
+    """
+    Notification state of a single (prefix, asn, type) alert of a monitor.
+
+    See prefixctl_bgp_monitor.alerts for the state machine.
+    """
+
+    monitor = models.ForeignKey(
+        BGPMonitor, related_name="alert_states", on_delete=models.CASCADE
+    )
+
+    prefix = models.CharField(max_length=64)
+    asn = models.BigIntegerField()
+    type = models.CharField(
+        max_length=16,
+        choices=(
+            ("hijack", _("Hijack")),
+            ("more_specific", _("More specific")),
+        ),
+    )
+
+    state = models.CharField(
+        max_length=16,
+        choices=(
+            ("pending", _("Pending")),
+            ("active", _("Active")),
+            ("clearing", _("Clearing")),
+            ("cleared", _("Cleared")),
+            ("damped", _("Damped")),
+            ("suppressed", _("Suppressed")),
+        ),
+        default="pending",
+    )
+
+    observed = models.BooleanField(
+        default=False, help_text="Alert was present in the last monitor run"
+    )
+    notified = models.BooleanField(
+        default=False, help_text="Last notification reported the alert as present"
+    )
+    damped = models.BooleanField(
+        default=False, help_text="Notifications are held back due to flapping"
+    )
+
+    changed = models.DateTimeField(help_text="When `observed` last changed")
+
+    penalty = models.FloatField(default=0, help_text="Flap damping penalty")
+    penalty_updated = models.DateTimeField(
+        null=True, blank=True, help_text="When the penalty was last increased"
+    )
+    flaps = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "prefixctl_bgp_monitor_alert_state"
+        verbose_name = "BGP Monitor Alert State"
+        verbose_name_plural = "BGP Monitor Alert States"
+        unique_together = (("monitor", "prefix", "asn", "type"),)
+        indexes = [models.Index(fields=["monitor", "state"])]
+
+    def __str__(self):
+        return f"{self.prefix} AS{self.asn} {self.type}: {self.state}"
+
+
+class BGPMonitorSuppression(models.Model):
+
+    """
+    User defined window during which alert transitions of a monitor are
+    not notified, e.g., for planned moves.
+
+    Transitions during the window are accepted silently.
+    """
+
+    # organization workspace instance, always the instance of the monitor
+    instance = models.ForeignKey(
+        Instance, related_name="bgp_monitor_suppressions", on_delete=models.CASCADE
+    )
+
+    monitor = models.ForeignKey(
+        BGPMonitor, related_name="suppressions", on_delete=models.CASCADE
+    )
+
+    prefix = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="Only suppress alerts for this prefix and its more specifics",
+    )
+    asn = models.BigIntegerField(
+        null=True, blank=True, help_text="Only suppress alerts for this ASN"
+    )
+
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    reason = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        db_table = "prefixctl_bgp_monitor_suppression"
+        verbose_name = "BGP Monitor Suppression"
+        verbose_name_plural = "BGP Monitor Suppressions"
+        indexes = [models.Index(fields=["monitor", "end"])]
+
+    def __str__(self):
+        return f"{self.monitor} {self.start} - {self.end}"
+
+    def save(self, *args, **kwargs):
+        self.instance_id = self.monitor.instance_id
+        super().save(*args, **kwargs)
+
+
 # TASK WORKER MODEL
 
 
@@ -140,6 +412,10 @@ class BGPMonitorTask(Task):
         # the limiter valus is defined via the generate_limit_id property
         limit = 1
 
+        # only qualify workers that the monitor is sharded to
+        # see prefixctl_bgp_monitor.sharding
+        qualifiers = [ShardQualifier()]
+
     @property
     def prefix_set_id(self) -> int:
         """
@@ -184,24 +460,76 @@ class BGPMonitorTask(Task):
         - kwargs: A dictionary of keyword arguments passed to the task through `create_task`
         """
 
-        prev_result = self.monitor.result
+        from prefixctl_bgp_monitor.alerts import next_check, process_alerts
+        from prefixctl_bgp_monitor.monitor import (
+            BGPMonitorFingerprints,
+            BGPMonitorResults,
+            bgp_monitor,
+        )
+
+        prev_snapshot = self.monitor.snapshot
+
+        if prev_snapshot and self.monitor.fingerprints:
+            previous = BGPMonitorResults.from_snapshot(prev_snapshot)
+            fingerprints = BGPMonitorFingerprints(**self.monitor.fingerprints)
+        else:
+            previous = fingerprints = None
 
         results = bgp_monitor(
             self.prefix_set,
             self.monitor.asn_set_origin,
+            previous=previous,
+            fingerprints=fingerprints,
         )
 
         self.monitor.checked = timezone.now()
-        self.monitor.result = results.model_dump()
-        self.monitor.save()
-
-        self.output = results.model_dump_json(indent=2)
 
-        if prev_result:
-            added, removed = results.diff(prev_result)
-            self.notify(added, removed)
+        if results.changed:
+            if previous is not None:
+                # only announcements of changed prefixes need to be diffed
+                added, removed = results.diff(
+                    previous, prefixes=results.changed_prefixes
+                )
+            elif prev_snapshot:
+                added, removed = results.diff(prev_snapshot)
+            else:
+                added, removed = results, BGPMonitorResults()
+
+            # the summary is maintained incrementally from the snapshot diff,
+            # so both have to be written together or not at all
+            with transaction.atomic():
+                self.monitor.snapshot = results.snapshot()
+                self.monitor.fingerprints = results.fingerprints.model_dump()
+                self.monitor.save()
+
+                BGPMonitorSummary.update(
+                    self.monitor.instance_id, added, removed, monitor=self.monitor
+                )
         else:
-            self.notify(results, BGPMonitorResults())
+            # nothing changed since the last run, only record the check
+            self.monitor.save(update_fields=["checked"])
+
+        # full results live in the monitor snapshot, only keep a summary here
+        self.output = json.dumps(
+            {
+                "announcements": len(results.announcements),
+                "hijacks": len(results.hijacks),
+                "more_specifics": len(results.more_specifics),
+                "changed": results.changed,
+            }
+        )
+
+        # only confirmed alert state transitions are notified, pending
+        # alerts can still be confirmed on an unchanged run
+        added, removed = process_alerts(self.monitor, results, changed=results.changed)
+
+        self.notify(added, removed)
+
+        # confirm alerts as soon as their hold-down passes instead of
+        # waiting for the next regular run
+        check = next_check(self.monitor)
+        if check:
+            self.monitor.schedule_check(check)
 
         return self.output
 
@@ -211,7 +539,7 @@ class BGPMonitorTask(Task):
             _asns.append(f"- AS{asn}")
         return "\n".join(_asns)
 
-    def notify(self, added: BGPMonitorResults, removed: BGPMonitorResults):
+    def notify(self, added: "BGPMonitorResults", removed: "BGPMonitorResults"):
         if not self.monitor.email:
             return
 
@@ -238,6 +566,8 @@ class BGPMonitorTask(Task):
             for prefix, asns in removed.more_specifics.items():
                 message += f"Prefix {prefix} no longer has these more specific announcements:\n{self.formatted_asns(asns)}\n\n"
 
+        from fullctl.django.mail import send_plain
+
         send_plain(
             subject,
             message,
@@ -4,6 +4,7 @@ BGP Monitor logic lives here
 We use IRRExplorers irrRoutes to get previous announcements and compare them to the current announcements
 """
 import datetime
+import hashlib
 import ipaddress
 from typing import Union
 
@@ -11,6 +12,8 @@ import pydantic
 from django_prefixctl.models.prefixctl import ASNSet, PrefixSet
 from prefix_meta.sources.irr_explorer import IRRExplorerData, IRRExplorerRequest
 
+from prefixctl_bgp_monitor.snapshot import Snapshot, encode
+
 
 class BGPMonitorResultLine(pydantic.BaseModel):
     prefix: str
@@ -18,11 +21,53 @@ class BGPMonitorResultLine(pydantic.BaseModel):
     asn: int
 
 
+class BGPMonitorFingerprints(pydantic.BaseModel):
+
+    """
+    Content fingerprints of the inputs to the last monitor run
+
+    - origin: fingerprint of the origin ASN set
+    - prefixes: fingerprint of the announcing ASNs per prefix
+    """
+
+    origin: str = ""
+    prefixes: dict[str, str] = pydantic.Field(default_factory=dict)
+
+
 class BGPMonitorResults(pydantic.BaseModel):
     announcements: dict[str, list[int]] = pydantic.Field(default_factory=dict)
     hijacks: dict[str, list[int]] = pydantic.Field(default_factory=dict)
     more_specifics: dict[str, list[int]] = pydantic.Field(default_factory=dict)
 
+    # set by `bgp_monitor`, not part of the dumped results
+    _fingerprints: BGPMonitorFingerprints = pydantic.PrivateAttr(
+        default_factory=BGPMonitorFingerprints
+    )
+    _changed: bool = pydantic.PrivateAttr(default=True)
+    _changed_prefixes: Union[set[str], None] = pydantic.PrivateAttr(default=None)
+
+    @property
+    def fingerprints(self) -> BGPMonitorFingerprints:
+        """
+        Fingerprints of the data these results were computed from
+        """
+        return self._fingerprints
+
+    @property
+    def changed(self) -> bool:
+        """
+        False if the results were carried over unchanged from the previous run
+        """
+        return self._changed
+
+    @property
+    def changed_prefixes(self) -> Union[set[str], None]:
+        """
+        Prefixes whose announcements may differ from the previous run,
+        None if any prefix may have changed
+        """
+        return self._changed_prefixes
+
     @property
     def lines(self) -> list[BGPMonitorResultLine]:
         """
@@ -47,21 +92,54 @@ class BGPMonitorResults(pydantic.BaseModel):
 
         return lines
 
-    def diff(self, other: Union["BGPMonitorResults", dict]) -> tuple:
+    @classmethod
+    def from_snapshot(
+        cls, data: Union[bytes, memoryview, Snapshot]
+    ) -> "BGPMonitorResults":
+        """
+        Load results from a binary snapshot
+        """
+        if not isinstance(data, Snapshot):
+            data = Snapshot(data)
+        return cls(**data.to_dict())
+
+    def snapshot(self) -> bytes:
+        """
+        Encode results to a binary snapshot
+        """
+        return encode(self)
+
+    def diff(
+        self,
+        other: Union["BGPMonitorResults", dict, bytes, memoryview, Snapshot],
+        prefixes: set[str] = None,
+    ) -> tuple:
         """
         Diff the current results with another BGPMonitorResults object
-        and return the differences
+        or binary snapshot and return the differences
+
+        If `prefixes` is specified announcements and hijacks are only diffed
+        for those prefixes, more specifics are always diffed in full.
 
         Will return a tuple of two BGPMonitorResults objects with added and removed items
         """
 
+        if isinstance(other, (bytes, memoryview)):
+            other = Snapshot(other)
+
+        if isinstance(other, Snapshot):
+            if prefixes is None:
+                added, removed = Snapshot(self.snapshot()).diff(other)
+                return BGPMonitorResults(**added), BGPMonitorResults(**removed)
+            other = BGPMonitorResults.from_snapshot(other)
+
         if isinstance(other, dict):
             other = BGPMonitorResults(**other)
 
         added_announcements, removed_announcements = self._process_diff(
-            "announcements", other
+            "announcements", other, prefixes
         )
-        added_hijacks, removed_hijacks = self._process_diff("hijacks", other)
+        added_hijacks, removed_hijacks = self._process_diff("hijacks", other, prefixes)
         added_more_specifics, removed_more_specifics = self._process_diff(
             "more_specifics", other
         )
@@ -80,53 +158,90 @@ class BGPMonitorResults(pydantic.BaseModel):
         )
 
     def _process_diff(
-        self, property: str, other: "BGPMonitorResults"
+        self, property: str, other: "BGPMonitorResults", prefixes: set[str] = None
     ) -> tuple[dict, dict]:
         """
-        Process a diff for a given property
+        Process a diff for a given property, optionally limited to `prefixes`
         """
 
         added = {}
         removed = {}
 
-        for prefix, asns in getattr(self, property).items():
-            if prefix not in getattr(other, property):
+        current = getattr(self, property)
+        previous = getattr(other, property)
+
+        if prefixes is not None:
+            current = {p: current[p] for p in prefixes if p in current}
+            previous = {p: previous[p] for p in prefixes if p in previous}
+
+        for prefix, asns in current.items():
+            if prefix not in previous:
                 added[prefix] = asns
             else:
-                _asns = [
-                    asn for asn in asns if asn not in getattr(other, property)[prefix]
-                ]
+                _previous = set(previous[prefix])
+                _asns = [asn for asn in asns if asn not in _previous]
                 if _asns:
                     added[prefix] = _asns
 
-        for prefix, asns in getattr(other, property).items():
-            if prefix not in getattr(self, property):
+        for prefix, asns in previous.items():
+            if prefix not in current:
                 removed[prefix] = asns
             else:
-                _asns = [
-                    asn for asn in asns if asn not in getattr(self, property)[prefix]
-                ]
+                _current = set(current[prefix])
+                _asns = [asn for asn in asns if asn not in _current]
                 if _asns:
                     removed[prefix] = _asns
 
         return added, removed
 
 
-def get_announcements(
+def get_announcements_data(
     prefix: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
     date: datetime.datetime = None,
-) -> list[int]:
+) -> Union[IRRExplorerData, None]:
     """
-    Get announcements for prefix from prefixctl-meta IRRExplorerData
-
-    Will return a list of ASNs
+    Get the prefixctl-meta IRRExplorerData row for a prefix
     """
     qset = IRRExplorerData.objects.filter(prefix=prefix)
 
     if date:
         qset = qset.filter(date__lte=date)
 
-    announcements = qset.first()
+    return qset.first()
+
+
+def get_announcements_data_bulk(
+    prefixes: list[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]],
+    date: datetime.datetime = None,
+) -> dict[str, IRRExplorerData]:
+    """
+    Get the prefixctl-meta IRRExplorerData rows for multiple prefixes in
+    one query
+
+    Returns a dict keyed by prefix string, picking the same row per prefix
+    as `get_announcements_data`
+    """
+    qset = IRRExplorerData.objects.filter(prefix__in=prefixes)
+
+    if date:
+        qset = qset.filter(date__lte=date)
+
+    # same row selection as `first()`
+    if not qset.ordered:
+        qset = qset.order_by("pk")
+
+    rows = {}
+    for row in qset:
+        rows.setdefault(str(row.prefix), row)
+    return rows
+
+
+def parse_announcements(announcements: Union[IRRExplorerData, None]) -> list[int]:
+    """
+    Parse the announcing ASNs from an IRRExplorerData row
+
+    Will return a list of ASNs
+    """
 
     if not announcements:
         return []
@@ -144,6 +259,29 @@ def get_announcements(
     return sorted(list(asns))
 
 
+def get_announcements(
+    prefix: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+    date: datetime.datetime = None,
+) -> list[int]:
+    """
+    Get announcements for prefix from prefixctl-meta IRRExplorerData
+
+    Will return a list of ASNs
+    """
+    return parse_announcements(get_announcements_data(prefix, date))
+
+
+def fingerprint(asns: list[int]) -> str:
+    """
+    Content fingerprint of an ASN list
+
+    Only the ASNs are hashed, classification does not depend on when the
+    source data was refreshed
+    """
+    value = ",".join(map(str, sorted(asns)))
+    return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()[:16]
+
+
 def identify_hijacks(
     announcements: dict[str, list[int]], asn_set: ASNSet
 ) -> dict[str, list[int]]:
@@ -154,7 +292,7 @@ def identify_hijacks(
 
     hijacks = {}
 
-    asn_set_asns = [asn.asn for asn in asn_set.asn_set.all()]
+    asn_set_asns = {asn.asn for asn in asn_set.asn_set.all()}
 
     for prefix, asns in announcements.items():
         hijackers = [asn for asn in asns if asn not in asn_set_asns]
@@ -178,6 +316,8 @@ def identify_more_specifics(
         prefix_set_prefix = ipaddress.ip_network(prefix_set_prefix)
         for prefix, asns in announcements.items():
             prefix = ipaddress.ip_network(prefix)
+            if prefix.version != prefix_set_prefix.version:
+                continue
             if prefix_set_prefix != prefix and prefix.subnet_of(prefix_set_prefix):
                 more_specifics[str(prefix_set_prefix)] = asns
 
@@ -187,27 +327,86 @@ def identify_more_specifics(
 def bgp_monitor(
     prefix_set: PrefixSet,
     origin_asn_set: ASNSet,
+    previous: BGPMonitorResults = None,
+    fingerprints: BGPMonitorFingerprints = None,
 ) -> BGPMonitorResults:
     """
     Processes the BGP Monitor for a given PrefixSet
 
     Will return a BGPAnnouncements object with the current and previous announcements
     for all prefixes in the given PrefixSet
+
+    If the results and fingerprints of the previous run are passed, only prefixes
+    whose fingerprint changed are reclassified, everything else is carried over.
+    If nothing changed `results.changed` will be False, otherwise
+    `results.changed_prefixes` holds the prefixes that may differ.
     """
 
     announcements = {}
+    hijacks = {}
+    changed = {}
 
     prefixes = list(prefix_set.prefix_set.all())
 
+    origin = fingerprint([asn.asn for asn in origin_asn_set.asn_set.all()])
+
+    # previous classification can only be reused if the origin set is the same
+    reuse = not (
+        previous is None or fingerprints is None or fingerprints.origin != origin
+    )
+    if not reuse:
+        previous = BGPMonitorResults()
+        fingerprints = BGPMonitorFingerprints()
+
+    current = BGPMonitorFingerprints(origin=origin)
+
     # update announcements from IRR Explorer
     IRRExplorerRequest.request([str(prefix.prefix) for prefix in prefixes])
 
     # get current announcements from prefixctl-meta IRRExplorerData
-    for prefix in prefixes:
-        announcements[str(prefix.prefix)] = get_announcements(prefix.prefix)
+    rows = get_announcements_data_bulk([prefix.prefix for prefix in prefixes])
 
-    return BGPMonitorResults(
+    for prefix in prefixes:
+        key = str(prefix.prefix)
+        asns = parse_announcements(rows.get(key))
+
+        current.prefixes[key] = fingerprint(asns)
+        announcements[key] = asns
+
+        if (
+            fingerprints.prefixes.get(key) == current.prefixes[key]
+            and key in previous.announcements
+        ):
+            if key in previous.hijacks:
+                hijacks[key] = previous.hijacks[key]
+        else:
+            changed[key] = asns
+
+    if changed:
+        hijacks.update(identify_hijacks(changed, origin_asn_set))
+
+    # more specifics depend on the whole prefix set, so they are recomputed
+    # if any prefix changed or prefixes were added or removed
+    if changed or current.prefixes.keys() != fingerprints.prefixes.keys():
+        more_specifics = identify_more_specifics(announcements, prefix_set)
+        is_changed = True
+    else:
+        more_specifics = previous.more_specifics
+        is_changed = False
+
+    results = BGPMonitorResults(
         announcements=announcements,
-        hijacks=identify_hijacks(announcements, origin_asn_set),
-        more_specifics=identify_more_specifics(announcements, prefix_set),
+        hijacks=hijacks,
+        more_specifics=more_specifics,
     )
+    results._fingerprints = current
+    results._changed = is_changed
+
+    # prefixes that were reclassified or removed, this lets the caller diff
+    # against the previous run without walking every prefix
+    if reuse:
+        results._changed_prefixes = set(changed) | (
+            fingerprints.prefixes.keys() - current.prefixes.keys()
+        )
+
+    return results
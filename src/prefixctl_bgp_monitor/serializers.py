@@ -1,3 +1,5 @@
+import ipaddress
+
 from django_prefixctl.rest.serializers.monitor import (
     MonitorCreationMixin,
     register_prefix_monitor,
@@ -29,6 +31,7 @@ class BGPMonitor(MonitorCreationMixin, ModelSerializer):
     )
     instance = serializers.PrimaryKeyRelatedField(read_only=True)
     email = serializers.EmailField(required=False)
+    result = serializers.SerializerMethodField()
 
     class Meta:
         model = models.BGPMonitor
@@ -42,6 +45,15 @@ class BGPMonitor(MonitorCreationMixin, ModelSerializer):
             "result",
         ]
 
+    def get_result(self, obj):
+        """
+        Exports the binary result snapshot as JSON
+        """
+        results = obj.results
+        if results is None:
+            return None
+        return results.model_dump()
+
 
 class BGPMonitorReportLine(serializers.Serializer):
     prefix = serializers.CharField()
@@ -56,3 +68,61 @@ class BGPMonitorReportLine(serializers.Serializer):
 class BGPMonitorReport(serializers.ListSerializer):
     ref_tag = "report"
     child = BGPMonitorReportLine()
+
+
+@register
+class BGPMonitorSummary(ModelSerializer):
+    ref_tag = "summary"
+
+    class Meta:
+        model = models.BGPMonitorSummary
+        fields = [
+            "announcements",
+            "hijacks",
+            "more_specifics",
+            "top_asns",
+            "events",
+            "updated",
+        ]
+
+
+@register
+class BGPMonitorSuppression(ModelSerializer):
+    ref_tag = "suppression"
+
+    class Meta:
+        model = models.BGPMonitorSuppression
+        fields = [
+            "id",
+            "monitor",
+            "prefix",
+            "asn",
+            "start",
+            "end",
+            "reason",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # only monitors of the requesting organization can be selected
+        request = self.context.get("request")
+        org = getattr(request, "org", None)
+        if org:
+            monitors = models.BGPMonitor.objects.filter(instance__org=org)
+        else:
+            monitors = models.BGPMonitor.objects.none()
+        self.fields["monitor"].queryset = monitors
+
+    def validate_prefix(self, value):
+        if not value:
+            return value
+        try:
+            return str(ipaddress.ip_network(value))
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate(self, data):
+        if data["end"] <= data["start"]:
+            raise serializers.ValidationError({"end": "Must be after start"})
+        return data
@@ -5,3 +5,56 @@ settings_manager = SettingsManager(settings.__dict__)
 
 # default prefixctl_bgp_monitor interval (seconds, 86400 = 1 day)
 settings_manager.set_option("BGP_MONITOR_SCHEDULE_INTERVAL", 86400)
+
+# sharded monitor execution across task worker nodes (see sharding.py)
+settings_manager.set_option("BGP_MONITOR_SHARDING", False)
+
+# shard id of this worker node, defaults to the fullctl task worker id
+settings_manager.set_option("BGP_MONITOR_SHARD_NODE", "")
+
+# hash monitors by `prefix_set` or by `org`
+settings_manager.set_option("BGP_MONITOR_SHARD_KEY", "prefix_set")
+
+# virtual nodes per worker node on the hash ring
+settings_manager.set_option("BGP_MONITOR_SHARD_VNODES", 64)
+
+# seconds without a heartbeat before a worker node is dropped from the ring,
+# nodes started through `bgp_monitor_poll_tasks` heartbeat every third of this
+settings_manager.set_option("BGP_MONITOR_SHARD_NODE_TTL", 60)
+
+# dead worker nodes are deleted once their last heartbeat is older than
+# this many times BGP_MONITOR_SHARD_NODE_TTL
+settings_manager.set_option("BGP_MONITOR_SHARD_NODE_EXPIRE", 10)
+
+# seconds a worker caches the hash ring before re-reading live nodes
+settings_manager.set_option("BGP_MONITOR_SHARD_RING_CACHE", 10)
+
+# this worker node only processes heavy monitors
+settings_manager.set_option("BGP_MONITOR_SHARD_HEAVY", False)
+
+# monitors with at least this many prefixes are routed to heavy nodes (0 = off)
+settings_manager.set_option("BGP_MONITOR_SHARD_HEAVY_PREFIXES", 1000)
+
+# number of top offending ASNs kept in the organization summary
+settings_manager.set_option("BGP_MONITOR_SUMMARY_TOP_ASNS", 10)
+
+# number of newest events kept in the organization summary
+settings_manager.set_option("BGP_MONITOR_SUMMARY_EVENTS", 50)
+
+# seconds an alert has to be stable before it is notified (0 = off)
+#
+# the monitor is re-run once the hold-down of a pending alert passes, so
+# alerts are notified about this long after first being observed
+settings_manager.set_option("BGP_MONITOR_ALERT_HOLD_DOWN", 900)
+
+# flap damping penalty added every time an alert flips
+settings_manager.set_option("BGP_MONITOR_ALERT_FLAP_PENALTY", 1000)
+
+# alerts are damped once their penalty reaches this value
+settings_manager.set_option("BGP_MONITOR_ALERT_SUPPRESS_THRESHOLD", 2000)
+
+# damped alerts are released once their penalty decays below this value
+settings_manager.set_option("BGP_MONITOR_ALERT_REUSE_THRESHOLD", 750)
+
+# flap penalty half-life (seconds, 172800 = 2 days)
+settings_manager.set_option("BGP_MONITOR_ALERT_HALF_LIFE", 172800)
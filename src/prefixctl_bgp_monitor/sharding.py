@@ -0,0 +1,279 @@
+"""
+Sharded execution of BGP monitor tasks across task worker nodes.
+
+Monitors are assigned to worker nodes by consistent hashing of either the
+prefix set or the organization (`BGP_MONITOR_SHARD_KEY`). Worker nodes announce
+themselves through heartbeats stored in the `BGPMonitorShardNode` table, so the
+hash ring rebalances when nodes join or leave, moving only the monitors that
+hashed to the affected node.
+
+Monitors with at least `BGP_MONITOR_SHARD_HEAVY_PREFIXES` prefixes are routed to
+a separate ring made up of nodes started with `BGP_MONITOR_SHARD_HEAVY` enabled.
+
+Sharding is disabled unless `BGP_MONITOR_SHARDING` is set, in which case any
+worker may process any monitor task.
+
+Workers need to be started through `bgp_monitor_poll_tasks`, which heartbeats
+on every poll whether or not monitor tasks are pending. Running several local
+workers for testing:
+
+    BGP_MONITOR_SHARDING=1 BGP_MONITOR_SHARD_NODE=node-a python manage.py bgp_monitor_poll_tasks
+    BGP_MONITOR_SHARDING=1 BGP_MONITOR_SHARD_NODE=node-b python manage.py bgp_monitor_poll_tasks
+"""
+import bisect
+import datetime
+import hashlib
+import time
+from typing import Union
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+from fullctl.django.tasks.qualifiers import Base
+from fullctl.django.tasks.util import worker_id
+
+__all__ = [
+    "HashRing",
+    "node_id",
+    "heartbeat",
+    "live_nodes",
+    "monitor_info",
+    "shard_key",
+    "is_heavy",
+    "assigned_node",
+    "ShardQualifier",
+]
+
+
+def _hash(value: str) -> int:
+    digest = hashlib.md5(value.encode(), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class HashRing:
+
+    """
+    Consistent hash ring with virtual nodes
+    """
+
+    def __init__(self, nodes: list[str] = None, vnodes: int = 64):
+        self.vnodes = vnodes
+        self.nodes = set()
+        self._keys = []
+        self._ring = {}
+        for node in nodes or []:
+            self.add(node)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            key = _hash(f"{node}#{i}")
+            self._ring[key] = node
+            bisect.insort(self._keys, key)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        for i in range(self.vnodes):
+            key = _hash(f"{node}#{i}")
+            del self._ring[key]
+            self._keys.pop(bisect.bisect_left(self._keys, key))
+
+    def get(self, key: Union[str, int]) -> Union[str, None]:
+        """
+        Returns the node owning the specified key, None if the ring is empty
+        """
+        if not self._keys:
+            return None
+        idx = bisect.bisect(self._keys, _hash(str(key))) % len(self._keys)
+        return self._ring[self._keys[idx]]
+
+
+def node_id() -> str:
+    """
+    Returns the shard node id for this worker
+
+    Can be specified through the `BGP_MONITOR_SHARD_NODE` setting, otherwise
+    falls back to the fullctl task worker id
+    """
+    return settings.BGP_MONITOR_SHARD_NODE or worker_id()
+
+
+# last heartbeat sent by this process (monotonic time)
+_last_heartbeat = 0
+
+# cached ring per `heavy` flag: (expires, HashRing)
+_rings = {}
+
+# cached routing info per prefix set id: (expires, org_id, prefix count)
+_monitor_info = {}
+
+
+def heartbeat(force: bool = False):
+    """
+    Announce this worker node as alive
+
+    Heartbeats are throttled to once every third of `BGP_MONITOR_SHARD_NODE_TTL`
+
+    Node ids default to `hostname:pid`, so every worker restart leaves a dead
+    node behind, those are removed once their last heartbeat is older than
+    `BGP_MONITOR_SHARD_NODE_EXPIRE` times the ttl.
+    """
+    global _last_heartbeat
+
+    from prefixctl_bgp_monitor.models import BGPMonitorShardNode
+
+    now = time.monotonic()
+    if not force and now - _last_heartbeat < settings.BGP_MONITOR_SHARD_NODE_TTL / 3:
+        return
+
+    BGPMonitorShardNode.objects.update_or_create(
+        node=node_id(),
+        defaults={
+            "heavy": settings.BGP_MONITOR_SHARD_HEAVY,
+            "heartbeat": timezone.now(),
+        },
+    )
+    _last_heartbeat = now
+
+    expire = timezone.now() - datetime.timedelta(
+        seconds=settings.BGP_MONITOR_SHARD_NODE_TTL
+        * settings.BGP_MONITOR_SHARD_NODE_EXPIRE
+    )
+    BGPMonitorShardNode.objects.filter(heartbeat__lt=expire).delete()
+
+
+def live_nodes(heavy: bool = False) -> list[str]:
+    """
+    Returns the ids of worker nodes with a recent heartbeat
+    """
+    from prefixctl_bgp_monitor.models import BGPMonitorShardNode
+
+    cutoff = timezone.now() - datetime.timedelta(
+        seconds=settings.BGP_MONITOR_SHARD_NODE_TTL
+    )
+    return list(
+        BGPMonitorShardNode.objects.filter(
+            heartbeat__gte=cutoff, heavy=heavy
+        ).values_list("node", flat=True)
+    )
+
+
+def get_ring(heavy: bool = False) -> HashRing:
+    """
+    Returns the hash ring of live nodes, cached for `BGP_MONITOR_SHARD_RING_CACHE`
+    seconds so rebalancing is picked up quickly without querying on every check.
+
+    If no heavy nodes are alive, heavy monitors fall back to the regular ring and
+    vice versa.
+    """
+    now = time.monotonic()
+    cached = _rings.get(heavy)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    nodes = live_nodes(heavy) or live_nodes(not heavy)
+    ring = HashRing(nodes, vnodes=settings.BGP_MONITOR_SHARD_VNODES)
+    _rings[heavy] = (now + settings.BGP_MONITOR_SHARD_RING_CACHE, ring)
+    return ring
+
+
+def monitor_info(prefix_set_id: int) -> tuple[Union[int, None], int]:
+    """
+    Returns the organization id and number of prefixes of the monitor
+    running for the prefix set, cached for `BGP_MONITOR_SHARD_RING_CACHE` seconds
+    """
+    from prefixctl_bgp_monitor.models import BGPMonitor
+
+    now = time.monotonic()
+    cached = _monitor_info.get(prefix_set_id)
+    if cached and cached[0] > now:
+        return cached[1:]
+
+    row = (
+        BGPMonitor.objects.filter(prefix_set_id=prefix_set_id)
+        .annotate(prefixes=Count("prefix_set__prefix_set"))
+        .values_list("instance__org_id", "prefixes")
+        .first()
+    )
+    org_id, prefixes = row or (None, 0)
+
+    _monitor_info[prefix_set_id] = (
+        now + settings.BGP_MONITOR_SHARD_RING_CACHE,
+        org_id,
+        prefixes,
+    )
+    return org_id, prefixes
+
+
+# the functions below are called by fullctl's task fetcher with the generic
+# Task instance, so they may only rely on the task parameters
+
+
+def shard_key(task) -> str:
+    """
+    Returns the consistent hashing key for a monitor task
+    """
+    prefix_set_id = task.param["args"][0]
+    if settings.BGP_MONITOR_SHARD_KEY == "org":
+        org_id, _ = monitor_info(prefix_set_id)
+        return f"org:{org_id}"
+    return f"prefix_set:{prefix_set_id}"
+
+
+def is_heavy(task) -> bool:
+    """
+    Returns whether the monitor task should be routed to the heavy ring
+    """
+    threshold = settings.BGP_MONITOR_SHARD_HEAVY_PREFIXES
+    if not threshold:
+        return False
+    _, prefixes = monitor_info(task.param["args"][0])
+    return prefixes >= threshold
+
+
+def assigned_node(task) -> Union[str, None]:
+    """
+    Returns the id of the worker node the monitor task is assigned to
+    """
+    return get_ring(is_heavy(task)).get(shard_key(task))
+
+
+class ShardQualifier(Base):
+
+    """
+    Task qualifier that only qualifies a worker for monitor tasks
+    that hash to it
+    """
+
+    recheck_time = 5
+
+    def __str__(self):
+        return f"{self.__class__.__name__} {node_id()}"
+
+    def ids(self, task):
+        # tasks assigned to the same node are skipped together for a poll cycle,
+        # tasks assigned to other nodes are still checked
+        if not settings.BGP_MONITOR_SHARDING:
+            return {}
+        return {"node": assigned_node(task)}
+
+    def check(self, task):
+        if not settings.BGP_MONITOR_SHARDING:
+            return True
+
+        heartbeat()
+
+        node = assigned_node(task)
+
+        # no live nodes known yet, let anyone take it
+        if node is None:
+            return True
+
+        return node == node_id()
@@ -3,7 +3,7 @@ from django.dispatch import receiver
 from django_prefixctl.models.prefixctl import ASN, Prefix
 from fullctl.django.models.concrete.tasks import TaskLimitError, TaskSchedule
 
-from prefixctl_bgp_monitor.models import BGPMonitor, BGPMonitorTask
+from prefixctl_bgp_monitor.models import BGPMonitor, BGPMonitorSummary, BGPMonitorTask
 
 
 @receiver(post_save, sender=Prefix)
@@ -36,7 +36,8 @@ def bgp_monitor_post_delete(sender, **kwargs):
     """
     Signal receiver for post-delete actions on a BGPMonitor.
 
-    Deletes the associated task sceduler when the BGPMonitor is deleted.
+    Deletes the associated task sceduler when the BGPMonitor is deleted
+    and removes its results from the organization summary.
 
     Arguments:
     sender: The model class that sent the signal.
@@ -44,6 +45,15 @@ def bgp_monitor_post_delete(sender, **kwargs):
     """
     bgp_monitor = kwargs.get("instance")
 
+    results = bgp_monitor.results
+
+    if results:
+        from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
+        BGPMonitorSummary.update(
+            bgp_monitor.instance_id, BGPMonitorResults(), results, create=False
+        )
+
     try:
         bgp_monitor.task_schedule.delete()
     except TaskSchedule.DoesNotExist:
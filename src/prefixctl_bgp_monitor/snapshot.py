@@ -0,0 +1,244 @@
+"""
+Compact binary snapshot encoding for BGP monitor results
+
+Layout (little endian):
+
+    magic     4s    b"BGPS"
+    version   B     snapshot format version
+
+    for each section (announcements, hijacks, more_specifics):
+
+        count     I     number of prefixes in the section
+
+        for each prefix:
+            family    B     4 or 6
+            length    B     prefix length
+            network   4s|16s packed network address
+            n         I     number of asns
+            asns      nI    sorted asns, delta encoded
+
+Decoding works on a `memoryview` of the snapshot, prefixes are keyed by
+zero-copy slices of their packed network/length bytes and only turned into
+strings when exported.
+"""
+import ipaddress
+import struct
+import sys
+from itertools import accumulate
+from typing import Iterable, Mapping, Union
+
+__all__ = [
+    "MAGIC",
+    "VERSION",
+    "SECTIONS",
+    "SnapshotError",
+    "encode",
+    "Snapshot",
+]
+
+MAGIC = b"BGPS"
+
+VERSION = 1
+
+SECTIONS = ("announcements", "hijacks", "more_specifics")
+
+_HEADER = struct.Struct("<4sB")
+_COUNT = struct.Struct("<I")
+_PREFIX = struct.Struct("<BB")
+
+_ADDRESS_SIZE = {4: 4, 6: 16}
+
+# asn arrays can be cast in place when the native uint32 layout matches
+_NATIVE_UINT32 = sys.byteorder == "little" and struct.calcsize("I") == 4
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _pack_prefix(prefix: str) -> bytes:
+    network = ipaddress.ip_network(prefix)
+    return (
+        _PREFIX.pack(network.version, network.prefixlen)
+        + network.network_address.packed
+    )
+
+
+def _unpack_prefix(key: Union[bytes, memoryview]) -> str:
+    version, prefixlen = _PREFIX.unpack_from(key)
+    address = bytes(key[_PREFIX.size :])
+    if version == 4:
+        return f"{ipaddress.IPv4Address(address)}/{prefixlen}"
+    return f"{ipaddress.IPv6Address(address)}/{prefixlen}"
+
+
+def _deltas(asns: Iterable[int]) -> list[int]:
+    deltas = []
+    last = 0
+    for asn in sorted(set(asns)):
+        deltas.append(asn - last)
+        last = asn
+    return deltas
+
+
+def encode(results: Union[Mapping[str, Mapping[str, list[int]]], object]) -> bytes:
+    """
+    Encode monitor results to a binary snapshot
+
+    Accepts either a BGPMonitorResults object or a dict as returned by
+    its `model_dump()`
+    """
+
+    parts = [_HEADER.pack(MAGIC, VERSION)]
+
+    for section in SECTIONS:
+        if isinstance(results, Mapping):
+            entries = results.get(section) or {}
+        else:
+            entries = getattr(results, section)
+
+        packed = sorted(
+            (_pack_prefix(prefix), asns) for prefix, asns in entries.items()
+        )
+
+        parts.append(_COUNT.pack(len(packed)))
+
+        for key, asns in packed:
+            deltas = _deltas(asns)
+            parts.append(key)
+            parts.append(struct.pack(f"<I{len(deltas)}I", len(deltas), *deltas))
+
+    return b"".join(parts)
+
+
+class Snapshot:
+
+    """
+    Read-only view of a binary snapshot
+
+    Sections are decoded lazily to `{packed prefix: frozenset(asns)}` where the
+    packed prefix is a memoryview slice of the snapshot buffer.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        # memoryview slices are only hashable if the underlying exporter is,
+        # so anything not backed by `bytes` is copied once
+        if isinstance(data, memoryview) and isinstance(data.obj, bytes):
+            self.buffer = data
+        elif isinstance(data, bytes):
+            self.buffer = memoryview(data)
+        else:
+            self.buffer = memoryview(bytes(data))
+        self._sections = None
+
+        if len(self.buffer) < _HEADER.size:
+            raise SnapshotError("Snapshot too short")
+
+        magic, version = _HEADER.unpack_from(self.buffer)
+
+        if magic != MAGIC:
+            raise SnapshotError("Not a BGP monitor snapshot")
+
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version: {version}")
+
+    def _decode(self) -> dict[str, dict[memoryview, frozenset]]:
+        try:
+            return self._decode_sections()
+        except struct.error as exc:
+            raise SnapshotError(f"Truncated snapshot: {exc}")
+
+    def _decode_sections(self) -> dict[str, dict[memoryview, frozenset]]:
+        buffer = self.buffer
+        size = len(buffer)
+        offset = _HEADER.size
+        sections = {}
+
+        for section in SECTIONS:
+            (count,) = _COUNT.unpack_from(buffer, offset)
+            offset += _COUNT.size
+
+            entries = {}
+
+            for _ in range(count):
+                family, _prefixlen = _PREFIX.unpack_from(buffer, offset)
+                try:
+                    end = offset + _PREFIX.size + _ADDRESS_SIZE[family]
+                except KeyError:
+                    raise SnapshotError(f"Invalid address family: {family}")
+
+                if end > size:
+                    raise SnapshotError("Truncated snapshot")
+
+                key = buffer[offset:end]
+                offset = end
+
+                (n,) = _COUNT.unpack_from(buffer, offset)
+                offset += _COUNT.size
+
+                if offset + n * 4 > size:
+                    raise SnapshotError("Truncated snapshot")
+
+                if _NATIVE_UINT32:
+                    deltas = buffer[offset : offset + n * 4].cast("I")
+                else:
+                    deltas = struct.unpack_from(f"<{n}I", buffer, offset)
+                offset += n * 4
+
+                entries[key] = frozenset(accumulate(deltas))
+
+            sections[section] = entries
+
+        return sections
+
+    @property
+    def sections(self) -> dict[str, dict[memoryview, frozenset]]:
+        if self._sections is None:
+            self._sections = self._decode()
+        return self._sections
+
+    def section(self, name: str) -> dict[str, list[int]]:
+        """
+        Returns a section with prefixes as strings and sorted asn lists
+        """
+        return {
+            _unpack_prefix(key): sorted(asns)
+            for key, asns in self.sections[name].items()
+        }
+
+    def to_dict(self) -> dict[str, dict[str, list[int]]]:
+        """
+        Export the snapshot in the same shape as `BGPMonitorResults.model_dump()`
+        """
+        return {section: self.section(section) for section in SECTIONS}
+
+    def diff(self, other: "Snapshot") -> tuple[dict, dict]:
+        """
+        Diff this snapshot against another snapshot
+
+        Returns a tuple of (added, removed) dicts in the same shape as `to_dict()`
+        """
+        added = {}
+        removed = {}
+
+        for section in SECTIONS:
+            added[section] = self._diff_section(
+                self.sections[section], other.sections[section]
+            )
+            removed[section] = self._diff_section(
+                other.sections[section], self.sections[section]
+            )
+
+        return added, removed
+
+    @staticmethod
+    def _diff_section(a: dict, b: dict) -> dict[str, list[int]]:
+        """
+        Returns asns per prefix that exist in `a` but not in `b`
+        """
+        result = {}
+        for key, asns in a.items():
+            _asns = asns - b.get(key, frozenset())
+            if _asns:
+                result[_unpack_prefix(key)] = sorted(_asns)
+        return result
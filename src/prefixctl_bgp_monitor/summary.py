@@ -0,0 +1,94 @@
+"""
+Incremental aggregation of the organization wide BGP monitor summary
+
+BGPMonitorSummary is never rebuilt from the monitor results, every monitor
+run applies the diff to its previous results instead:
+
+- announcement, hijack and more specific counters are adjusted by the number
+  of added and removed (prefix, asn) pairs
+- `asns` counts the hijacked prefixes per offending ASN, ASNs are dropped
+  once their count reaches zero
+- `top_asns` is the `BGP_MONITOR_SUMMARY_TOP_ASNS` highest counts
+- `events` keeps the newest `BGP_MONITOR_SUMMARY_EVENTS` hijack and more
+  specific changes
+"""
+import datetime
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from prefixctl_bgp_monitor.models import BGPMonitor, BGPMonitorSummary
+    from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
+__all__ = [
+    "FIELDS",
+    "is_empty",
+    "apply_diff",
+]
+
+FIELDS = ("announcements", "hijacks", "more_specifics")
+
+
+def is_empty(added: "BGPMonitorResults", removed: "BGPMonitorResults") -> bool:
+    """
+    Returns whether the diff would leave the summary unchanged
+    """
+    return not any(
+        getattr(results, field) for results in (added, removed) for field in FIELDS
+    )
+
+
+def apply_diff(
+    summary: "BGPMonitorSummary",
+    added: "BGPMonitorResults",
+    removed: "BGPMonitorResults",
+    monitor: "BGPMonitor" = None,
+    now: datetime.datetime = None,
+):
+    """
+    Apply a monitor result diff to the summary counters
+    """
+
+    for field in FIELDS:
+        delta = sum(len(asns) for asns in getattr(added, field).values()) - sum(
+            len(asns) for asns in getattr(removed, field).values()
+        )
+        setattr(summary, field, max(getattr(summary, field) + delta, 0))
+
+    asns = summary.asns
+    for results, delta in [(added, 1), (removed, -1)]:
+        for hijackers in results.hijacks.values():
+            for asn in hijackers:
+                count = asns.get(str(asn), 0) + delta
+                if count > 0:
+                    asns[str(asn)] = count
+                else:
+                    asns.pop(str(asn), None)
+
+    ranked = sorted(asns.items(), key=lambda item: (-item[1], int(item[0])))
+    summary.top_asns = [
+        {"asn": int(asn), "count": count}
+        for asn, count in ranked[: settings.BGP_MONITOR_SUMMARY_TOP_ASNS]
+    ]
+
+    now = (now or timezone.now()).isoformat()
+    events = []
+    for results, event in [(added, "added"), (removed, "removed")]:
+        for line in results.lines:
+            if line.type == "announcement":
+                continue
+            events.append(
+                {
+                    "monitor": monitor.id if monitor else None,
+                    "prefix_set": monitor.prefix_set.name if monitor else None,
+                    "prefix": line.prefix,
+                    "asn": line.asn,
+                    "type": line.type,
+                    "event": event,
+                    "time": now,
+                }
+            )
+
+    summary.events = (events + summary.events)[: settings.BGP_MONITOR_SUMMARY_EVENTS]
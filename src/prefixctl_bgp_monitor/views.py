@@ -5,7 +5,6 @@ from rest_framework import viewsets
 from rest_framework.response import Response
 
 import prefixctl_bgp_monitor.models as models
-from prefixctl_bgp_monitor.monitor import BGPMonitorResults
 from prefixctl_bgp_monitor.serializers import Serializers
 
 
@@ -27,7 +26,80 @@ class BGPMonitorReport(OrgQuerysetMixin, viewsets.GenericViewSet):
         Retrieve the BGP announcements for a given monitor
         """
 
+        from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+
         monitor = self.get_object()
-        result = BGPMonitorResults(**monitor.result)
+        result = monitor.results or BGPMonitorResults()
 
         return Response(self.get_serializer(result.lines).data)
+
+
+@route
+class BGPMonitorSummary(OrgQuerysetMixin, viewsets.GenericViewSet):
+
+    """
+    Organization wide BGP Monitor summary REST API
+    """
+
+    ref_tag = "bgp_monitor/summary"
+
+    queryset = models.BGPMonitorSummary.objects.all()
+    serializer_class = Serializers.summary
+
+    @grainy_endpoint(namespace="prefix_monitor.{request.org.permission_id}")
+    def list(self, request, *args, **kwargs):
+        """
+        Retrieve counts by type, top offending ASNs and newest events
+        across all BGP monitors of the organization
+        """
+
+        # `asns` grows with the number of offending asns and is not exported
+        summary = (
+            self.get_queryset().defer("asns").first() or models.BGPMonitorSummary()
+        )
+
+        return Response(self.get_serializer(summary).data)
+
+
+@route
+class BGPMonitorSuppression(OrgQuerysetMixin, viewsets.GenericViewSet):
+
+    """
+    BGP Monitor alert suppression windows REST API
+    """
+
+    ref_tag = "bgp_monitor/suppression"
+
+    queryset = models.BGPMonitorSuppression.objects.all()
+    serializer_class = Serializers.suppression
+
+    @grainy_endpoint(namespace="prefix_monitor.{request.org.permission_id}")
+    def list(self, request, *args, **kwargs):
+        """
+        List suppression windows for the organization's monitors
+        """
+
+        return Response(self.get_serializer(self.get_queryset(), many=True).data)
+
+    @grainy_endpoint(namespace="prefix_monitor.{request.org.permission_id}")
+    def create(self, request, *args, **kwargs):
+        """
+        Create a suppression window, alert transitions of the monitor that
+        happen during the window are not notified
+        """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    @grainy_endpoint(namespace="prefix_monitor.{request.org.permission_id}")
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete a suppression window
+        """
+
+        suppression = self.get_object()
+        response = Response(self.get_serializer(suppression).data)
+        suppression.delete()
+        return response
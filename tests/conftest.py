@@ -0,0 +1,41 @@
+import importlib.util
+import sys
+import types
+
+from django.conf import settings
+
+# the monitor logic is tested without a database, the prefixctl and
+# prefix-meta models it imports are stubbed if they are not installed
+STUB_MODULES = {
+    "django_prefixctl.models.prefixctl": ("ASNSet", "PrefixSet"),
+    "prefix_meta.sources.irr_explorer": ("IRRExplorerData", "IRRExplorerRequest"),
+}
+
+
+def stub_modules():
+    for name, attrs in STUB_MODULES.items():
+        if importlib.util.find_spec(name.split(".")[0]) is not None:
+            continue
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            path = ".".join(parts[:i])
+            sys.modules.setdefault(path, types.ModuleType(path))
+        for attr in attrs:
+            setattr(sys.modules[name], attr, type(attr, (), {}))
+
+
+def pytest_configure(config):
+    # unit tests run without a django project, configure the bare minimum
+    # and register the addon's default settings
+    if not settings.configured:
+        settings.configure(USE_TZ=True)
+
+    import prefixctl_bgp_monitor.settings  # noqa
+
+    # the settings manager caches the defaults on the lazy settings object,
+    # move them to the wrapped settings so `override_settings` keeps them
+    for name, value in list(settings.__dict__.items()):
+        if name.startswith("BGP_MONITOR_"):
+            setattr(settings, name, value)
+
+    stub_modules()
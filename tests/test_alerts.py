@@ -0,0 +1,201 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from prefixctl_bgp_monitor.alerts import (
+    advance,
+    hold_down_expires,
+    is_expired,
+    is_suppressed,
+)
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+HALF_LIFE = datetime.timedelta(seconds=172800)
+
+
+@pytest.fixture(autouse=True)
+def no_hold_down(settings):
+    # damping and suppression are tested without hold-down,
+    # the hold-down tests turn it back on
+    settings.BGP_MONITOR_ALERT_HOLD_DOWN = 0
+
+
+def minutes(n):
+    return NOW + datetime.timedelta(minutes=n)
+
+
+def new_state(observed=True, now=NOW):
+    """
+    Alert state as created by `process_alerts` for a newly seen alert
+    """
+    return SimpleNamespace(
+        state="pending",
+        observed=observed,
+        notified=False,
+        damped=False,
+        changed=now,
+        penalty=0,
+        penalty_updated=None,
+        flaps=0,
+    )
+
+
+def active_state():
+    state = new_state()
+    advance(state, True, False, NOW)
+    assert state.state == "active"
+    return state
+
+
+def test_appear_notified():
+    state = new_state()
+
+    assert advance(state, True, False, NOW) == (True, True)
+    assert state.state == "active"
+    assert state.notified
+
+    # nothing left to do on the next run
+    assert advance(state, True, False, minutes(5)) == (False, None)
+
+
+def test_pending_confirmed_on_unchanged_run(settings):
+    settings.BGP_MONITOR_ALERT_HOLD_DOWN = 900
+    state = new_state()
+
+    assert advance(state, True, False, NOW) == (False, None)
+    assert state.state == "pending"
+
+    # unchanged run inside the hold-down
+    assert advance(state, True, False, minutes(10)) == (False, None)
+    assert state.state == "pending"
+
+    # unchanged run after the hold-down confirms the alert
+    assert advance(state, True, False, minutes(15)) == (True, True)
+    assert state.state == "active"
+
+
+def test_hold_down_short_lived_alert_not_notified(settings):
+    settings.BGP_MONITOR_ALERT_HOLD_DOWN = 900
+    state = new_state()
+
+    advance(state, True, False, NOW)
+    assert state.state == "pending"
+
+    # gone again before the hold-down passed
+    assert advance(state, False, False, minutes(5)) == (True, None)
+    assert state.state == "cleared"
+    assert not state.notified
+
+
+def test_hold_down_expires(settings):
+    settings.BGP_MONITOR_ALERT_HOLD_DOWN = 900
+
+    state = new_state()
+    advance(state, True, False, NOW)
+    assert hold_down_expires(state) == minutes(15)
+
+    advance(state, True, False, minutes(15))
+    assert state.state == "active"
+    assert hold_down_expires(state) is None
+
+    # removal waits for the hold-down as well
+    advance(state, False, False, minutes(20))
+    assert state.state == "clearing"
+    assert hold_down_expires(state) == minutes(35)
+
+
+def test_flap_damped():
+    state = active_state()
+
+    # gone, penalty 1000
+    assert advance(state, False, False, minutes(5)) == (True, False)
+    assert state.state == "cleared"
+
+    # back, penalty just below 2000
+    assert advance(state, True, False, minutes(10)) == (True, True)
+    assert state.state == "active"
+
+    # gone again, penalty ~3000, damped and not notified
+    assert advance(state, False, False, minutes(15)) == (True, None)
+    assert state.state == "damped"
+    assert state.damped
+    assert state.notified
+    assert state.flaps == 3
+
+    # still flapping, still quiet
+    assert advance(state, True, False, minutes(20)) == (True, None)
+    assert advance(state, False, False, minutes(25)) == (True, None)
+    assert state.state == "damped"
+
+
+def test_damped_released_after_decay():
+    state = active_state()
+    for n, observed in enumerate([False, True, False], 1):
+        advance(state, observed, False, minutes(n * 5))
+    assert state.damped
+
+    # one half-life later the penalty is still above the reuse threshold
+    assert advance(state, False, False, minutes(15) + HALF_LIFE) == (False, None)
+    assert state.damped
+
+    # after two half-lives it decayed below 750, the pending removal is sent
+    assert advance(state, False, False, minutes(16) + 2 * HALF_LIFE) == (True, False)
+    assert not state.damped
+    assert state.state == "cleared"
+    assert not state.notified
+
+
+def test_suppression_adopted_silently():
+    state = active_state()
+
+    # alert goes away during a suppression window
+    assert advance(state, False, True, minutes(5)) == (True, None)
+    assert state.state == "suppressed"
+    assert not state.notified
+
+    # window ended, the removal was adopted and is not notified
+    assert advance(state, False, False, minutes(65)) == (True, None)
+    assert state.state == "cleared"
+
+
+def test_cleared_state_expires():
+    state = active_state()
+
+    advance(state, False, False, minutes(5))
+    assert state.state == "cleared"
+
+    # flap history is kept until the penalty decayed
+    assert not is_expired(state, minutes(5))
+    assert not is_expired(state, minutes(5) + 9 * HALF_LIFE)
+    assert is_expired(state, minutes(5) + 10 * HALF_LIFE)
+
+
+def test_unsettled_state_never_expires():
+    state = new_state()
+    assert not is_expired(state, NOW + 100 * HALF_LIFE)
+
+    advance(state, True, False, NOW)
+    assert not is_expired(state, NOW + 100 * HALF_LIFE)
+
+
+@pytest.mark.parametrize(
+    "prefix,asn,suppressed",
+    [
+        ("192.0.2.0/24", 64500, True),
+        ("192.0.2.128/25", 64500, True),
+        ("198.51.100.0/24", 64500, False),
+        ("192.0.2.0/24", 64501, False),
+        ("2001:db8::/32", 64500, False),
+    ],
+)
+def test_is_suppressed(prefix, asn, suppressed):
+    suppressions = [SimpleNamespace(prefix="192.0.2.0/24", asn=64500)]
+    assert is_suppressed(suppressions, prefix, asn) == suppressed
+
+
+def test_is_suppressed_any():
+    suppressions = [SimpleNamespace(prefix=None, asn=None)]
+    assert is_suppressed(suppressions, "2001:db8::/48", 64500)
+    assert not is_suppressed([], "2001:db8::/48", 64500)
@@ -0,0 +1,205 @@
+import ipaddress
+from types import SimpleNamespace
+
+import pytest
+
+from prefixctl_bgp_monitor import monitor
+from prefixctl_bgp_monitor.monitor import BGPMonitorResults, bgp_monitor
+
+ORIGIN = [64500, 64501]
+
+ANNOUNCEMENTS = {
+    "192.0.2.0/24": [64500],
+    "192.0.2.128/25": [64500, 64666],
+    "198.51.100.0/24": [64501, 64777],
+    "203.0.113.0/24": [64500],
+    "2001:db8::/32": [64501],
+}
+
+
+class Related(list):
+    def all(self):
+        return self
+
+
+def prefix_set(prefixes):
+    return SimpleNamespace(
+        prefix_set=Related(
+            SimpleNamespace(prefix=ipaddress.ip_network(prefix)) for prefix in prefixes
+        )
+    )
+
+
+def asn_set(asns):
+    return SimpleNamespace(asn_set=Related(SimpleNamespace(asn=asn) for asn in asns))
+
+
+@pytest.fixture
+def irr(monkeypatch):
+    """
+    Announcement data served to `bgp_monitor`, keyed by prefix
+    """
+    data = {}
+
+    def get_announcements_data_bulk(prefixes, date=None):
+        return {
+            str(prefix): SimpleNamespace(
+                data=[
+                    {"irrRoutes": {"RIPE": [{"asn": asn} for asn in data[str(prefix)]]}}
+                ],
+                date=None,
+            )
+            for prefix in prefixes
+            if str(prefix) in data
+        }
+
+    monkeypatch.setattr(
+        monitor, "get_announcements_data_bulk", get_announcements_data_bulk
+    )
+    monkeypatch.setattr(
+        monitor,
+        "IRRExplorerRequest",
+        SimpleNamespace(request=lambda prefixes: None),
+        raising=False,
+    )
+    return data
+
+
+def run(announcements, origin=ORIGIN, last=None):
+    """
+    Run the monitor the way BGPMonitorTask does, feeding it the previous
+    results through their snapshot
+    """
+    if last is None:
+        previous = fingerprints = None
+    else:
+        previous = BGPMonitorResults.from_snapshot(last.snapshot())
+        fingerprints = last.fingerprints
+
+    return bgp_monitor(
+        prefix_set(announcements.keys()),
+        asn_set(origin),
+        previous=previous,
+        fingerprints=fingerprints,
+    )
+
+
+def test_full_run(irr):
+    irr.update(ANNOUNCEMENTS)
+    results = run(ANNOUNCEMENTS)
+
+    assert results.changed
+    assert results.changed_prefixes is None
+    assert results.hijacks == {
+        "192.0.2.128/25": [64666],
+        "198.51.100.0/24": [64777],
+    }
+    assert results.more_specifics == {"192.0.2.0/24": [64500, 64666]}
+
+
+def test_unchanged_run(irr):
+    irr.update(ANNOUNCEMENTS)
+    first = run(ANNOUNCEMENTS)
+    second = run(ANNOUNCEMENTS, last=first)
+
+    assert not second.changed
+    assert second.changed_prefixes == set()
+    assert second.model_dump() == first.model_dump()
+
+
+def test_unchanged_run_new_data_date(irr, monkeypatch):
+    irr.update(ANNOUNCEMENTS)
+    first = run(ANNOUNCEMENTS)
+
+    # refreshed source data with the same asns is not a change
+    bulk = monitor.get_announcements_data_bulk
+
+    def refreshed(prefixes, date=None):
+        rows = bulk(prefixes, date)
+        for row in rows.values():
+            row.date = "2026-10-19"
+        return rows
+
+    monkeypatch.setattr(monitor, "get_announcements_data_bulk", refreshed)
+
+    assert not run(ANNOUNCEMENTS, last=first).changed
+
+
+def test_single_prefix_change(irr):
+    irr.update(ANNOUNCEMENTS)
+    first = run(ANNOUNCEMENTS)
+
+    irr["198.51.100.0/24"] = [64501, 64888]
+    second = run(ANNOUNCEMENTS, last=first)
+
+    assert second.changed
+    assert second.changed_prefixes == {"198.51.100.0/24"}
+
+    # carried over classification matches a full reclassification
+    assert second.model_dump() == run(ANNOUNCEMENTS).model_dump()
+
+    previous = BGPMonitorResults.from_snapshot(first.snapshot())
+    added, removed = second.diff(previous, prefixes=second.changed_prefixes)
+    full_added, full_removed = second.diff(first.snapshot())
+
+    assert added.model_dump() == full_added.model_dump()
+    assert removed.model_dump() == full_removed.model_dump()
+    assert added.hijacks == {"198.51.100.0/24": [64888]}
+    assert removed.hijacks == {"198.51.100.0/24": [64777]}
+
+
+def test_prefix_removed(irr):
+    irr.update(ANNOUNCEMENTS)
+    first = run(ANNOUNCEMENTS)
+
+    announcements = dict(ANNOUNCEMENTS)
+    del announcements["192.0.2.128/25"]
+    second = run(announcements, last=first)
+
+    assert second.changed
+    assert second.changed_prefixes == {"192.0.2.128/25"}
+    assert second.more_specifics == {}
+
+    previous = BGPMonitorResults.from_snapshot(first.snapshot())
+    added, removed = second.diff(previous, prefixes=second.changed_prefixes)
+    full_added, full_removed = second.diff(first.snapshot())
+
+    assert added.model_dump() == full_added.model_dump()
+    assert removed.model_dump() == full_removed.model_dump()
+    assert removed.announcements == {"192.0.2.128/25": [64500, 64666]}
+    assert removed.hijacks == {"192.0.2.128/25": [64666]}
+    assert removed.more_specifics == {"192.0.2.0/24": [64500, 64666]}
+
+
+def test_prefix_added_more_specific(irr):
+    irr.update(ANNOUNCEMENTS)
+    irr["203.0.113.0/25"] = [64500]
+    first = run(ANNOUNCEMENTS)
+
+    announcements = dict(ANNOUNCEMENTS, **{"203.0.113.0/25": [64500]})
+    second = run(announcements, last=first)
+
+    assert second.changed_prefixes == {"203.0.113.0/25"}
+    assert second.more_specifics == {
+        "192.0.2.0/24": [64500, 64666],
+        "203.0.113.0/24": [64500],
+    }
+
+
+def test_origin_change(irr):
+    irr.update(ANNOUNCEMENTS)
+    first = run(ANNOUNCEMENTS)
+
+    second = run(ANNOUNCEMENTS, origin=[64500, 64501, 64777], last=first)
+
+    assert second.changed
+    assert second.changed_prefixes is None
+    assert second.hijacks == {"192.0.2.128/25": [64666]}
+    assert (
+        second.model_dump()
+        == run(ANNOUNCEMENTS, origin=[64500, 64501, 64777]).model_dump()
+    )
+
+    added, removed = second.diff(first.snapshot())
+    assert added.hijacks == {}
+    assert removed.hijacks == {"198.51.100.0/24": [64777]}
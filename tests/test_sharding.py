@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+
+from prefixctl_bgp_monitor import sharding
+from prefixctl_bgp_monitor.sharding import HashRing
+
+KEYS = [f"prefix_set:{i}" for i in range(2000)]
+
+
+def assignments(ring):
+    return {key: ring.get(key) for key in KEYS}
+
+
+def test_hash_ring_empty():
+    assert HashRing().get("prefix_set:1") is None
+
+
+def test_hash_ring_stable():
+    ring_a = HashRing(["a", "b", "c"])
+    ring_b = HashRing(["c", "a", "b"])
+
+    assert assignments(ring_a) == assignments(ring_b)
+    assert set(assignments(ring_a).values()) == {"a", "b", "c"}
+
+
+def test_hash_ring_add_node_moves_minimal_keys():
+    ring = HashRing(["a", "b", "c"])
+    before = assignments(ring)
+
+    ring.add("d")
+    after = assignments(ring)
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+
+    # only keys that now belong to the new node move
+    assert all(after[key] == "d" for key in moved)
+    # roughly a quarter of the keys should move to the new node
+    assert len(KEYS) * 0.1 < len(moved) < len(KEYS) * 0.4
+
+
+def test_hash_ring_remove_node_moves_minimal_keys():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = assignments(ring)
+
+    ring.remove("d")
+    after = assignments(ring)
+
+    for key in KEYS:
+        if before[key] != "d":
+            assert after[key] == before[key]
+        else:
+            assert after[key] in {"a", "b", "c"}
+
+
+def test_hash_ring_add_remove_roundtrip():
+    ring = HashRing(["a", "b", "c"])
+    before = assignments(ring)
+
+    ring.add("d")
+    ring.remove("d")
+
+    assert assignments(ring) == before
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    live = {False: [], True: []}
+    monkeypatch.setattr(sharding, "live_nodes", lambda heavy=False: live[heavy])
+    monkeypatch.setattr(sharding, "_rings", {})
+    monkeypatch.setattr(
+        sharding, "monitor_info", lambda prefix_set_id: (1, prefix_set_id)
+    )
+    return live
+
+
+def task(prefixes):
+    # generic fullctl Task, prefix set id doubles as prefix count via `nodes`
+    return SimpleNamespace(param={"args": [prefixes]})
+
+
+def test_heavy_monitors_use_heavy_ring(nodes, settings):
+    settings.BGP_MONITOR_SHARD_HEAVY_PREFIXES = 1000
+    nodes[False] = ["a", "b"]
+    nodes[True] = ["heavy"]
+
+    assert sharding.assigned_node(task(5000)) == "heavy"
+    assert sharding.assigned_node(task(10)) in {"a", "b"}
+
+
+def test_heavy_monitors_fall_back_to_regular_ring(nodes, settings):
+    settings.BGP_MONITOR_SHARD_HEAVY_PREFIXES = 1000
+    nodes[False] = ["a", "b"]
+
+    assert sharding.assigned_node(task(5000)) in {"a", "b"}
+
+
+def test_regular_monitors_fall_back_to_heavy_ring(nodes, settings):
+    settings.BGP_MONITOR_SHARD_HEAVY_PREFIXES = 1000
+    nodes[True] = ["heavy"]
+
+    assert sharding.assigned_node(task(10)) == "heavy"
+
+
+def test_qualifier_ids_generic_task(nodes, settings):
+    settings.BGP_MONITOR_SHARDING = True
+    nodes[False] = ["a"]
+
+    assert sharding.ShardQualifier().ids(task(10)) == {"node": "a"}
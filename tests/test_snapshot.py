@@ -0,0 +1,155 @@
+import struct
+
+import pytest
+
+from prefixctl_bgp_monitor.migrations import _snapshot_v1
+from prefixctl_bgp_monitor.snapshot import (
+    MAGIC,
+    VERSION,
+    Snapshot,
+    SnapshotError,
+    encode,
+)
+
+RESULTS = {
+    "announcements": {
+        "192.0.2.0/24": [64500, 13335, 4294967295],
+        "2001:db8::/32": [65001, 1],
+        "198.51.100.0/24": [],
+    },
+    "hijacks": {"192.0.2.0/24": [4294967295]},
+    "more_specifics": {},
+}
+
+
+def test_roundtrip():
+    assert Snapshot(encode(RESULTS)).to_dict() == {
+        "announcements": {
+            "192.0.2.0/24": [13335, 64500, 4294967295],
+            "2001:db8::/32": [1, 65001],
+            "198.51.100.0/24": [],
+        },
+        "hijacks": {"192.0.2.0/24": [4294967295]},
+        "more_specifics": {},
+    }
+
+
+def test_encode_deterministic():
+    reordered = {
+        "more_specifics": {},
+        "hijacks": {"192.0.2.0/24": [4294967295]},
+        "announcements": dict(reversed(list(RESULTS["announcements"].items()))),
+    }
+    assert encode(RESULTS) == encode(reordered)
+
+
+def test_encode_object():
+    class Results:
+        announcements = RESULTS["announcements"]
+        hijacks = RESULTS["hijacks"]
+        more_specifics = RESULTS["more_specifics"]
+
+    assert encode(Results()) == encode(RESULTS)
+
+
+def test_migration_codec():
+    # the frozen migration codec has to stay compatible with format version 1
+    assert VERSION == 1
+    assert _snapshot_v1.encode(RESULTS) == encode(RESULTS)
+    assert _snapshot_v1.decode(encode(RESULTS)) == Snapshot(encode(RESULTS)).to_dict()
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_buffer_types(wrap):
+    data = wrap(encode(RESULTS))
+    assert Snapshot(data).to_dict() == Snapshot(encode(RESULTS)).to_dict()
+
+
+def test_memoryview_of_bytearray():
+    data = memoryview(bytearray(encode(RESULTS)))
+    assert Snapshot(data).to_dict() == Snapshot(encode(RESULTS)).to_dict()
+
+
+def test_diff():
+    other = {
+        "announcements": {
+            "192.0.2.0/24": [13335],
+            "203.0.113.0/24": [64496],
+            "2001:db8::/32": [1, 65001],
+        },
+        "hijacks": {},
+        "more_specifics": {"2001:db8::/32": [65002]},
+    }
+
+    added, removed = Snapshot(encode(RESULTS)).diff(Snapshot(encode(other)))
+
+    assert added == {
+        "announcements": {"192.0.2.0/24": [64500, 4294967295]},
+        "hijacks": {"192.0.2.0/24": [4294967295]},
+        "more_specifics": {},
+    }
+    assert removed == {
+        "announcements": {"203.0.113.0/24": [64496]},
+        "hijacks": {},
+        "more_specifics": {"2001:db8::/32": [65002]},
+    }
+
+
+def test_diff_identical():
+    added, removed = Snapshot(encode(RESULTS)).diff(Snapshot(encode(RESULTS)))
+    for section in (added, removed):
+        assert section == {"announcements": {}, "hijacks": {}, "more_specifics": {}}
+
+
+def test_empty():
+    assert Snapshot(encode({})).to_dict() == {
+        "announcements": {},
+        "hijacks": {},
+        "more_specifics": {},
+    }
+
+
+def test_bad_magic():
+    with pytest.raises(SnapshotError):
+        Snapshot(b"XXXX" + encode(RESULTS)[4:])
+
+
+def test_bad_version():
+    with pytest.raises(SnapshotError):
+        Snapshot(struct.pack("<4sB", MAGIC, VERSION + 1) + encode(RESULTS)[5:])
+
+
+def test_too_short():
+    with pytest.raises(SnapshotError):
+        Snapshot(b"BGP")
+
+
+@pytest.mark.parametrize(
+    "cut",
+    [
+        # inside a section count
+        7,
+        # inside a prefix header
+        10,
+        # inside a network address
+        13,
+        # inside an asn count
+        17,
+        # inside an asn array
+        25,
+        # last byte missing
+        -1,
+    ],
+)
+def test_truncated(cut):
+    data = encode(RESULTS)[:cut]
+    with pytest.raises(SnapshotError):
+        Snapshot(data).to_dict()
+
+
+def test_bad_family():
+    data = bytearray(encode({"hijacks": {"192.0.2.0/24": [1]}}))
+    # header, empty announcements section, hijacks count, family byte
+    data[5 + 4 + 4] = 5
+    with pytest.raises(SnapshotError):
+        Snapshot(data).to_dict()
@@ -0,0 +1,173 @@
+import datetime
+from types import SimpleNamespace
+
+from prefixctl_bgp_monitor.monitor import BGPMonitorResults
+from prefixctl_bgp_monitor.summary import apply_diff, is_empty
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+MONITOR = SimpleNamespace(id=1, prefix_set=SimpleNamespace(name="customers"))
+
+DIFF = BGPMonitorResults(
+    announcements={
+        "192.0.2.0/24": [64500, 64666],
+        "2001:db8::/32": [64501],
+    },
+    hijacks={"192.0.2.0/24": [64666]},
+    more_specifics={"192.0.2.0/24": [64500]},
+)
+
+
+def new_summary():
+    """
+    Empty summary with the same defaults as BGPMonitorSummary
+    """
+    return SimpleNamespace(
+        announcements=0,
+        hijacks=0,
+        more_specifics=0,
+        asns={},
+        top_asns=[],
+        events=[],
+    )
+
+
+def test_is_empty():
+    assert is_empty(BGPMonitorResults(), BGPMonitorResults())
+    assert not is_empty(DIFF, BGPMonitorResults())
+    assert not is_empty(BGPMonitorResults(), DIFF)
+    assert not is_empty(
+        BGPMonitorResults(announcements={"192.0.2.0/24": [64500]}),
+        BGPMonitorResults(),
+    )
+
+
+def test_apply_added():
+    summary = new_summary()
+    apply_diff(summary, DIFF, BGPMonitorResults(), MONITOR, now=NOW)
+
+    assert summary.announcements == 3
+    assert summary.hijacks == 1
+    assert summary.more_specifics == 1
+    assert summary.asns == {"64666": 1}
+    assert summary.top_asns == [{"asn": 64666, "count": 1}]
+    assert summary.events == [
+        {
+            "monitor": 1,
+            "prefix_set": "customers",
+            "prefix": "192.0.2.0/24",
+            "asn": 64666,
+            "type": "hijack",
+            "event": "added",
+            "time": NOW.isoformat(),
+        },
+        {
+            "monitor": 1,
+            "prefix_set": "customers",
+            "prefix": "192.0.2.0/24",
+            "asn": 64500,
+            "type": "more_specific",
+            "event": "added",
+            "time": NOW.isoformat(),
+        },
+    ]
+
+
+def test_apply_added_then_removed():
+    summary = new_summary()
+    apply_diff(summary, DIFF, BGPMonitorResults(), MONITOR, now=NOW)
+    apply_diff(summary, BGPMonitorResults(), DIFF, MONITOR, now=NOW)
+
+    assert summary.announcements == 0
+    assert summary.hijacks == 0
+    assert summary.more_specifics == 0
+    assert summary.asns == {}
+    assert summary.top_asns == []
+
+    # removals are events too, newest first
+    assert [event["event"] for event in summary.events] == [
+        "removed",
+        "removed",
+        "added",
+        "added",
+    ]
+
+
+def test_apply_counters_never_negative():
+    summary = new_summary()
+    apply_diff(summary, BGPMonitorResults(), DIFF, MONITOR, now=NOW)
+
+    assert summary.announcements == 0
+    assert summary.hijacks == 0
+    assert summary.more_specifics == 0
+    assert summary.asns == {}
+
+
+def test_asns_counted_per_prefix():
+    summary = new_summary()
+    apply_diff(
+        summary,
+        BGPMonitorResults(
+            hijacks={
+                "192.0.2.0/24": [64666],
+                "198.51.100.0/24": [64666, 64777],
+            }
+        ),
+        BGPMonitorResults(),
+        now=NOW,
+    )
+    assert summary.asns == {"64666": 2, "64777": 1}
+
+    apply_diff(
+        summary,
+        BGPMonitorResults(),
+        BGPMonitorResults(hijacks={"192.0.2.0/24": [64666]}),
+        now=NOW,
+    )
+    assert summary.asns == {"64666": 1, "64777": 1}
+
+
+def test_top_asns_capped(settings):
+    settings.BGP_MONITOR_SUMMARY_TOP_ASNS = 3
+
+    hijacks = {}
+    # asn 64500 + n hijacks n + 1 prefixes
+    for n in range(6):
+        for i in range(n + 1):
+            hijacks.setdefault(f"10.{i}.0.0/16", []).append(64500 + n)
+
+    summary = new_summary()
+    apply_diff(
+        summary, BGPMonitorResults(hijacks=hijacks), BGPMonitorResults(), now=NOW
+    )
+
+    assert len(summary.asns) == 6
+    assert summary.top_asns == [
+        {"asn": 64505, "count": 6},
+        {"asn": 64504, "count": 5},
+        {"asn": 64503, "count": 4},
+    ]
+
+
+def test_events_capped(settings):
+    settings.BGP_MONITOR_SUMMARY_EVENTS = 5
+
+    summary = new_summary()
+    for i in range(4):
+        apply_diff(
+            summary,
+            BGPMonitorResults(hijacks={f"10.{i}.0.0/16": [64666, 64777]}),
+            BGPMonitorResults(),
+            now=NOW,
+        )
+
+    assert len(summary.events) == 5
+    # newest first
+    assert [event["prefix"] for event in summary.events] == [
+        "10.3.0.0/16",
+        "10.3.0.0/16",
+        "10.2.0.0/16",
+        "10.2.0.0/16",
+        "10.1.0.0/16",
+    ]
+    assert summary.hijacks == 8